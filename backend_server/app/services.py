@@ -55,7 +55,7 @@ class PortfolioService:
             # Refresh market data post-create to initialize total_value/weights
             .and_then(lambda p: safe_call(lambda: (p.refresh_data(), p)[1]))
             .map(self._store_portfolio)
-            .map(lambda p: (upsert_portfolio(p.name, p.holdings), p)[1])
+            .map(lambda p: (upsert_portfolio(p.name, dict(p.holdings)), p)[1])
             .map(self._portfolio_to_response)
         )
     
@@ -202,7 +202,7 @@ class PortfolioService:
         
         return PortfolioResponse(
             name=portfolio.name,
-            holdings=portfolio.holdings,
+            holdings=dict(portfolio.holdings),
             total_value=portfolio.total_value,
             current_weights=portfolio.current_weights,
             created_at=portfolio.created_at,
@@ -18,16 +18,18 @@ Usage:
     python -m portfolio_lib.analysis
 """
 
+import functools
 import importlib
 import inspect
 import pkgutil
-from collections import defaultdict
+import sys
+from collections import OrderedDict, defaultdict
 from dataclasses import dataclass
+from datetime import date, datetime
 from typing import Any, Dict, List, Optional, Tuple, Iterable, Union
 
 import numpy as np
 import pandas as pd
-import plotly.graph_objects as go
 
 from portfolio_lib.models.strategy import BacktestConfig, StrategyConfig
 from portfolio_lib.services.backtesting.backtester import BacktestingService
@@ -106,10 +108,15 @@ def default_settings() -> AnalysisDefaults:
 # -----------------------------
 
 
+@functools.lru_cache(maxsize=1)
 def discover_strategies() -> List[BaseStrategy]:
     """
     Import all modules in portfolio_lib.services.strategy and instantiate classes
     that inherit from BaseStrategy (excluding the base itself).
+
+    Memoized per process; strategies hold no per-run state (each backtest gets its
+    own StrategyConfig) so the instances are reused. Call
+    discover_strategies.cache_clear() after adding strategy modules at runtime.
     """
     strategies: List[BaseStrategy] = []
     pkg_name = "portfolio_lib.services.strategy"
@@ -193,121 +200,220 @@ def fetch_aligned_price_history(
     return price_history
 
 
-def compute_initial_holdings(
+def build_close_panel(
     price_history: Dict[str, pd.DataFrame],
+    bt_cfg: Optional[BacktestConfig] = None,
+) -> pd.DataFrame:
+    """
+    Collapse the per-symbol OHLCV frames into one wide close panel (date x symbol).
+    Dates missing for a symbol are NaN so each column keeps its own trading calendar.
+    When bt_cfg is given the panel is clipped to the backtest window in the same pass.
+    """
+    closes = {
+        sym: df["close"]
+        for sym, df in price_history.items()
+        if df is not None and not df.empty and "close" in df.columns
+    }
+    if not closes:
+        return pd.DataFrame(dtype=float)
+    panel = pd.concat(closes, axis=1).sort_index()
+    if bt_cfg is not None:
+        start_bound = pd.Timestamp(bt_cfg.start_date).tz_localize(None)
+        end_bound = pd.Timestamp(bt_cfg.end_date).tz_localize(None)
+        panel = panel.loc[start_bound:end_bound]
+    return panel.astype(float)
+
+
+def _first_quoted_rows(panel: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Row position of each column's first non-NaN value, located in one pass over the
+    (sorted) panel, and whether the column has any value at all.
+    """
+    quoted = panel.notna().to_numpy()
+    return quoted.argmax(axis=0), quoted.any(axis=0)
+
+
+def compute_initial_holdings(
+    close_panel: pd.DataFrame,
     symbols: List[str],
     initial_capital: float,
 ) -> Dict[str, float]:
-    # Find first common date across all symbols that have data
-    first_dates = [
-        df.index.min()
-        for s, df in price_history.items()
-        if hasattr(df, "empty")
-        and not df.empty
-        and s in symbols
-        and isinstance(df.index.min(), pd.Timestamp)
-    ]
-    if not first_dates:
+    universe = close_panel[[s for s in symbols if s in close_panel.columns]]
+    # No rows (e.g. the window clipped every quote) or no columns: argmax cannot run
+    if universe.empty:
         raise RuntimeError("Could not find any first dates for given symbols.")
-    first_common = max(first_dates)
-
-    start_prices: Dict[str, float] = {}
-    for s in symbols:
-        df = price_history.get(s)
-        if (
-            df is not None
-            and isinstance(first_common, pd.Timestamp)
-            and first_common in df.index
-        ):
-            start_prices[s] = float(df.loc[first_common, "close"])
-
-    symbols_valid = [
-        s
-        for s in symbols
-        if s in start_prices and start_prices[s] > 0 and np.isfinite(start_prices[s])
-    ]
-    if len(symbols_valid) < 3:
+    # Find first common date across all symbols that have data: the latest of each
+    # column's first quoted row
+    first_rows, has_data = _first_quoted_rows(universe)
+    if not has_data.any():
+        raise RuntimeError("Could not find any first dates for given symbols.")
+    first_common = universe.index[int(first_rows[has_data].max())]
+
+    start_prices = universe.loc[first_common]
+    start_prices = start_prices[np.isfinite(start_prices) & (start_prices > 0)]
+    if len(start_prices) < 3:
         raise RuntimeError(
             "Not enough valid symbols with start prices to build initial holdings."
         )
 
-    capital_per = initial_capital / len(symbols_valid)
-    initial_holdings = {s: capital_per / start_prices[s] for s in symbols_valid}
+    capital_per = initial_capital / len(start_prices)
+    symbols_valid = [s for s in symbols if s in start_prices.index]
+    initial_holdings = {s: capital_per / float(start_prices[s]) for s in symbols_valid}
     return initial_holdings
 
 
-def run_backtests_for_strategies(
-    strategies: List[BaseStrategy],
-    defaults: AnalysisDefaults,
-    data_service: YFinanceDataService,
-    backtester: BacktestingService,
-) -> Tuple[Dict[str, Any], Dict[str, pd.DataFrame], BacktestConfig]:
+@dataclass(frozen=True)
+class PreparedUniverse:
+    """Fetched inputs shared by every backtest in an analysis run."""
+
+    symbols: Tuple[str, ...]
+    bt_cfg: BacktestConfig
+    price_history: Dict[str, pd.DataFrame]
+    close_panel: pd.DataFrame
+    initial_holdings: Dict[str, float]
+
+
+# Prepared universes keyed by their inputs so notebook re-runs reuse one fetch;
+# LRU-bounded since the key moves with today's date in a long-lived session
+_UNIVERSE_CACHE_SIZE = 2
+_UNIVERSE_CACHE: "OrderedDict[Tuple[Any, ...], PreparedUniverse]" = OrderedDict()
+
+
+def clear_universe_cache() -> None:
+    """Forget prepared universes so the next prepare_universe() call refetches."""
+    _UNIVERSE_CACHE.clear()
+
+
+def prepare_universe(
+    defaults: AnalysisDefaults, data_service: YFinanceDataService
+) -> PreparedUniverse:
+    """
+    Build the backtest window, fetch universe + benchmark once and derive the
+    equal-weight initial holdings. The last few results are memoized per
+    process; call clear_universe_cache() to force a refetch (e.g. after a
+    partial download).
+    """
     bt_cfg = build_backtest_config(defaults)
+    key = (
+        tuple(defaults.symbols),
+        bt_cfg.benchmark,
+        bt_cfg.start_date,
+        bt_cfg.end_date,
+        bt_cfg.initial_capital,
+        bt_cfg.commission,
+        bt_cfg.slippage,
+        data_service.get_data_source_name(),
+    )
+    cached = _UNIVERSE_CACHE.get(key)
+    if cached is not None:
+        _UNIVERSE_CACHE.move_to_end(key)
+        return cached
 
     # Fetch once: universe + benchmark
     symbols_full = list(dict.fromkeys(defaults.symbols + [bt_cfg.benchmark]))
     price_history = fetch_aligned_price_history(data_service, symbols_full, bt_cfg)
 
+    close_panel = build_close_panel(price_history, bt_cfg)
+
     # Build initial holdings using universe only (not benchmark)
     initial_holdings = compute_initial_holdings(
-        price_history, defaults.symbols, bt_cfg.initial_capital
+        close_panel, defaults.symbols, bt_cfg.initial_capital
+    )
+
+    universe = PreparedUniverse(
+        symbols=tuple(defaults.symbols),
+        bt_cfg=bt_cfg,
+        price_history=price_history,
+        close_panel=close_panel,
+        initial_holdings=initial_holdings,
+    )
+    _UNIVERSE_CACHE[key] = universe
+    while len(_UNIVERSE_CACHE) > _UNIVERSE_CACHE_SIZE:
+        _UNIVERSE_CACHE.popitem(last=False)
+    return universe
+
+
+def build_strategy_config(strategy: BaseStrategy, defaults: AnalysisDefaults) -> StrategyConfig:
+    """Build a per-strategy config merging defaults and overrides."""
+    s_name = getattr(strategy, "name", strategy.__class__.__name__)
+    # Use overrides by class name first, then by display name for convenience
+    override_params = (
+        defaults.strategy_overrides.get(strategy.__class__.__name__)
+        or defaults.strategy_overrides.get(s_name)
+        or {}
+    )
+    # StrategyConfig.parameters is a free-form dict
+    return StrategyConfig(
+        name=s_name,
+        parameters=override_params,
+        rebalance_frequency=defaults.rebalance_frequency,
+        risk_tolerance=defaults.risk_tolerance,
+        max_position_size=defaults.max_position_size,
     )
 
+
+def run_backtests_for_strategies(
+    strategies: List[Tuple[BaseStrategy, StrategyConfig]],
+    universe: PreparedUniverse,
+    backtester: BacktestingService,
+) -> Dict[str, Any]:
     results: Dict[str, Any] = {}
-    for strategy in strategies:
-        s_name = getattr(strategy, "name", strategy.__class__.__name__)
-        # Build per-strategy config merging defaults and overrides
-        # Use overrides by class name first, then by display name for convenience
-        override_params = (
-            defaults.strategy_overrides.get(strategy.__class__.__name__)
-            or defaults.strategy_overrides.get(s_name)
-            or {}
-        )
-        # StrategyConfig.parameters is a free-form dict
-        strat_cfg = StrategyConfig(
-            name=s_name,
-            parameters=override_params,
-            rebalance_frequency=defaults.rebalance_frequency,
-            risk_tolerance=defaults.risk_tolerance,
-            max_position_size=defaults.max_position_size,
-        )
+    for strategy, strat_cfg in strategies:
+        s_name = strat_cfg.name
         try:
             res = backtester.run_backtest(
                 strategy=strategy,
                 strategy_config=strat_cfg,
-                backtest_config=bt_cfg,
-                initial_holdings=initial_holdings,
+                backtest_config=universe.bt_cfg,
+                initial_holdings=universe.initial_holdings,
             )
             results[s_name] = res
         except Exception as e:
             print(f"[WARN] Strategy '{s_name}' failed to run: {e}")
-    return results, price_history, bt_cfg
+    return results
+
+
+def _as_date(value: Any) -> date:
+    # BacktestResult dates are datetimes (pd.Timestamp included); only re-parse anything else
+    if isinstance(value, datetime):
+        return value.date()
+    return pd.to_datetime(value).date()
+
+
+_METRICS_TEMPLATE = (
+    "=== {title} ===\n"
+    "Strategy: {name}\n"
+    "Period: {start} to {end}\n"
+    "Total Return: {tr:.2%}\n"
+    "Annualized Return: {ar:.2%}\n"
+    "Volatility: {vol:.2%}\n"
+    "Sharpe Ratio: {sr:.2f}\n"
+    "Max Drawdown: {md:.2%}\n"
+    "Benchmark ({bench}): {br:.2%}\n"
+)
 
 
 def print_metrics(title: str, res: Any) -> None:
-    print(f"=== {title} ===")
-    print("Strategy:", res.strategy_name)
-    print(
-        "Period:",
-        pd.to_datetime(res.start_date).date(),
-        "to",
-        pd.to_datetime(res.end_date).date(),
+    # Render the whole block up front and emit it with a single write
+    text = _METRICS_TEMPLATE.format(
+        title=title,
+        name=res.strategy_name,
+        start=_as_date(res.start_date),
+        end=_as_date(res.end_date),
+        tr=res.total_return,
+        ar=res.annualized_return,
+        vol=res.volatility,
+        sr=res.sharpe_ratio,
+        md=res.max_drawdown,
+        bench=getattr(getattr(res, "config", None), "benchmark", "Benchmark"),
+        br=res.benchmark_return,
     )
-    print(f"Total Return: {res.total_return:.2%}")
-    print(f"Annualized Return: {res.annualized_return:.2%}")
-    print(f"Volatility: {res.volatility:.2%}")
-    print(f"Sharpe Ratio: {res.sharpe_ratio:.2f}")
-    print(f"Max Drawdown: {res.max_drawdown:.2%}")
-    bench_name = getattr(getattr(res, "config", None), "benchmark", "Benchmark")
-    print(f"Benchmark ({bench_name}): {res.benchmark_return:.2%}")
     if hasattr(res, "total_trades"):
-        print(
-            "Trades - total/wins/loses:",
-            getattr(res, "total_trades", 0),
-            getattr(res, "winning_trades", 0),
-            getattr(res, "losing_trades", 0),
+        text += (
+            f"Trades - total/wins/loses: {getattr(res, 'total_trades', 0)} "
+            f"{getattr(res, 'winning_trades', 0)} {getattr(res, 'losing_trades', 0)}\n"
         )
-    print()
+    sys.stdout.write(text + "\n")
 
 
 def normalized_series(values: List[float], timestamps: List[pd.Timestamp]) -> pd.Series:
@@ -327,30 +433,16 @@ def normalized_series(values: List[float], timestamps: List[pd.Timestamp]) -> pd
 
 
 def build_benchmark_series(
-    price_history: Dict[str, pd.DataFrame], bt_cfg: BacktestConfig
+    close_panel: pd.DataFrame, bt_cfg: BacktestConfig
 ) -> Optional[pd.Series]:
-    if bt_cfg.benchmark not in price_history:
+    if bt_cfg.benchmark not in close_panel.columns:
         return None
-    bench_df = price_history[bt_cfg.benchmark]
-    bench_prices = bench_df["close"]
-
-    if (
-        isinstance(bench_prices.index, pd.DatetimeIndex)
-        and bench_prices.index.tz is not None
-    ):
-        bench_prices = bench_prices.tz_localize(None)
-
     start_bound = pd.Timestamp(bt_cfg.start_date).tz_localize(None)
     end_bound = pd.Timestamp(bt_cfg.end_date).tz_localize(None)
-    mask = (bench_prices.index >= start_bound) & (bench_prices.index <= end_bound)
-    bench_prices_filtered = bench_prices[mask]
-
-    if (
-        isinstance(bench_prices_filtered, pd.Series)
-        and bench_prices_filtered.shape[0] > 1
-    ):
-        series = bench_prices_filtered / bench_prices_filtered.iloc[0]
-        return series
+    bench_prices = close_panel[bt_cfg.benchmark].loc[start_bound:end_bound].dropna()
+
+    if bench_prices.shape[0] > 1:
+        return bench_prices / bench_prices.iloc[0]
     return None
 
 
@@ -394,7 +486,7 @@ def determine_common_period(
 
 
 def compute_baseline_series(
-    price_history: Dict[str, pd.DataFrame],
+    close_panel: pd.DataFrame,
     bt_cfg: BacktestConfig,
     universe_symbols: List[str],
 ) -> Optional[pd.Series]:
@@ -404,40 +496,29 @@ def compute_baseline_series(
     """
     if not universe_symbols:
         return None
-    # Determine common start bounded by bt_cfg
     start_bound = pd.Timestamp(bt_cfg.start_date).tz_localize(None)
     end_bound = pd.Timestamp(bt_cfg.end_date).tz_localize(None)
 
-    # Build normalized price series for each symbol starting at its first price ON/AFTER start_bound.
-    norm_series: List[pd.Series] = []
-    valid_syms: List[str] = []
-    for sym in universe_symbols:
-        df = price_history.get(sym)
-        if df is None or df.empty or "close" not in df.columns:
-            continue
-        s = df["close"]
-        if isinstance(s.index, pd.DatetimeIndex) and s.index.tz is not None:
-            s = s.tz_localize(None)
-        # Restrict to bounds
-        s = s[(s.index >= start_bound) & (s.index <= end_bound)]
-        if s.shape[0] < 2:
-            continue
-        s = s / s.iloc[0]
-        s.name = sym
-        norm_series.append(s)
-        valid_syms.append(sym)
-
-    if len(norm_series) < 2:
+    cols = [s for s in universe_symbols if s in close_panel.columns]
+    window = close_panel.loc[start_bound:end_bound, cols]
+    # Keep symbols with at least two prices inside the bounds
+    window = window.loc[:, window.notna().sum() >= 2]
+    if window.shape[1] < 2:
         return None
 
-    # Align by inner join on dates so we use the common intersection for initial weights.
-    df_norm = pd.concat(norm_series, axis=1, join="inner").sort_index()
+    # Normalize each symbol at its first price ON/AFTER start_bound, then keep the
+    # common date intersection so initial weights apply to the same day.
+    first_rows, _ = _first_quoted_rows(window)
+    first_prices = pd.Series(
+        window.to_numpy()[first_rows, np.arange(window.shape[1])], index=window.columns
+    )
+    df_norm = (window / first_prices).dropna(how="any")
     if df_norm.shape[0] < 2:
         return None
 
     # Equal weights across valid symbols at t0; hold constant thereafter.
     w = np.full(df_norm.shape[1], 1.0 / df_norm.shape[1])
-    baseline = (df_norm.values @ w)
+    baseline = (df_norm.to_numpy() @ w)
     baseline_s = pd.Series(baseline, index=df_norm.index, name="Baseline (Buy & Hold)")
     # Normalize to 1 at start (should already be near 1 but guard due to numeric)
     baseline_s = baseline_s / float(baseline_s.iloc[0])
@@ -452,53 +533,39 @@ def plot_results(
 
     # Build normalized series set
     norm_curves: Dict[str, pd.Series] = {}
-    union_index = None
     for name, res in results.items():
         s = common_normalized_series(res, common_start, common_end)
-        if s.empty:
-            continue
-        union_index = (
-            s.index if union_index is None else union_index.union(s.index).sort_values()
-        )
-        norm_curves[name] = s
-
-    # Prepare benchmark aligned to common period
-    bench_plot = None
-    baseline_plot = None
-    if benchmark_series is not None and (common_start is not None and common_end is not None):
-        bench = benchmark_series[
-            (benchmark_series.index >= common_start)
-            & (benchmark_series.index <= common_end)
-        ]
-        if len(bench) > 1:
-            bench = bench / bench.iloc[0]
-            union_index = (
-                union_index.union(bench.index).sort_values()
-                if union_index is not None
-                else bench.index
-            )
-            bench_plot = bench.reindex(union_index, method="pad")
-
-    # Prepare baseline aligned to common period
-    if baseline_series is not None and (common_start is not None and common_end is not None):
-        base = baseline_series[
-            (baseline_series.index >= common_start)
-            & (baseline_series.index <= common_end)
-        ]
-        if len(base) > 1:
-            base = base / base.iloc[0]
-            union_index = (
-                union_index.union(base.index).sort_values()
-                if union_index is not None
-                else base.index
-            )
-            baseline_plot = base.reindex(union_index, method="pad")
+        if not s.empty:
+            norm_curves[name] = s
+
+    # Prepare benchmark and baseline clipped to the common period
+    bench = None
+    base = None
+    if common_start is not None and common_end is not None:
+        if benchmark_series is not None:
+            bench = benchmark_series[
+                (benchmark_series.index >= common_start)
+                & (benchmark_series.index <= common_end)
+            ]
+            bench = bench / bench.iloc[0] if len(bench) > 1 else None
+        if baseline_series is not None:
+            base = baseline_series[
+                (baseline_series.index >= common_start)
+                & (baseline_series.index <= common_end)
+            ]
+            base = base / base.iloc[0] if len(base) > 1 else None
+
+    # Union every plotted series' dates once (sorted by Index.union), then pad each onto it
+    indexes = [s.index for s in norm_curves.values()]
+    indexes += [extra.index for extra in (bench, base) if extra is not None]
+    union_index = functools.reduce(lambda a, b: a.union(b), indexes) if indexes else None
+    bench_plot = bench.reindex(union_index, method="pad") if bench is not None else None
+    baseline_plot = base.reindex(union_index, method="pad") if base is not None else None
+
+    # Use Plotly for interactive visualization (imported lazily: data-only use never pays for it)
+    import plotly.graph_objects as go
 
-    # Use Plotly for interactive visualization
     fig = go.Figure()
-    if union_index is None and norm_curves:
-        # fallback if only single curve
-        union_index = next(iter(norm_curves.values())).index
 
     # Plot strategies
     for name, s in norm_curves.items():
@@ -805,6 +872,8 @@ def plot_allocation_stack(
     dfp = dfp.sort_index()
 
     # Plotly stacked area chart
+    import plotly.graph_objects as go
+
     fig = go.Figure()
     cum = np.zeros(len(dfp), dtype=float)
     xvals = dfp.index
@@ -984,6 +1053,8 @@ def plot_trade_markers(
         dfp = dfp.tz_localize(None)
 
     # Figure with background price line
+    import plotly.graph_objects as go
+
     fig = go.Figure()
     fig.add_trace(
         go.Scatter(
@@ -1013,9 +1084,16 @@ def plot_trade_markers(
         else:
             price_series = dfp["close"]
 
-        # Split into buys and sells
-        buys_x, buys_y, buys_text = [], [], []
-        sells_x, sells_y, sells_text = [], [], []
+        # Split into buys and sells: preallocate per side from the known trade counts
+        n_buys = sum(1 for t in trds if t.get("action") == "buy")
+        n_sells = len(trds) - n_buys
+        buys_x = np.empty(n_buys, dtype="datetime64[ns]")
+        buys_y = np.full(n_buys, np.nan)
+        buys_text = np.empty(n_buys, dtype=object)
+        sells_x = np.empty(n_sells, dtype="datetime64[ns]")
+        sells_y = np.full(n_sells, np.nan)
+        sells_text = np.empty(n_sells, dtype=object)
+        nb = ns = 0
 
         for t in trds:
             ts = t.get("timestamp")
@@ -1057,19 +1135,27 @@ def plot_trade_markers(
                     base
                     + f"Position After: {pos_after:.4f}  Avg Cost: {avg_cost_after:.2f}<br>{reason}"
                 )
-                buys_x.append(ts)
-                buys_y.append(y)
-                buys_text.append(hover)
+                buys_x[nb] = pd.Timestamp(ts).to_datetime64()
+                if y is not None:
+                    buys_y[nb] = y
+                buys_text[nb] = hover
+                nb += 1
             elif t.get("action") == "sell":
                 hover = (
                     base
                     + f"Realized PnL: {realized_pnl:.2f} ({realized_pnl_ps:.2f}/sh)<br>Position After: {pos_after:.4f}  Avg Cost: {avg_cost_after:.2f}<br>{reason}"
                 )
-                sells_x.append(ts)
-                sells_y.append(y)
-                sells_text.append(hover)
+                sells_x[ns] = pd.Timestamp(ts).to_datetime64()
+                if y is not None:
+                    sells_y[ns] = y
+                sells_text[ns] = hover
+                ns += 1
 
-        if buys_x:
+        # Trades without a timestamp were skipped; trim to the filled slots
+        buys_x, buys_y, buys_text = buys_x[:nb], buys_y[:nb], buys_text[:nb]
+        sells_x, sells_y, sells_text = sells_x[:ns], sells_y[:ns], sells_text[:ns]
+
+        if nb:
             fig.add_trace(
                 go.Scatter(
                     x=buys_x,
@@ -1086,7 +1172,7 @@ def plot_trade_markers(
                     text=buys_text,
                 )
             )
-        if sells_x:
+        if ns:
             fig.add_trace(
                 go.Scatter(
                     x=sells_x,
@@ -1106,7 +1192,7 @@ def plot_trade_markers(
 
     # Title and layout
     period_str = (
-        f"{pd.to_datetime(res.start_date).date()} to {pd.to_datetime(res.end_date).date()}"
+        f"{_as_date(res.start_date)} to {_as_date(res.end_date)}"
         if hasattr(res, "start_date")
         else ""
     )
@@ -1121,46 +1207,27 @@ def plot_trade_markers(
     fig.show()
 
 
-def main():
-    # Defaults
-    defaults = default_settings()
-
-    # Services
-    data_service = YFinanceDataService()
-    backtester = BacktestingService(data_service)
-
-    # Discover and run strategies
-    strategies = discover_strategies()
-    if not strategies:
-        raise RuntimeError(
-            "No strategies discovered. Ensure they subclass BaseStrategy and are importable."
-        )
-    print(
-        f"Discovered strategies: {[getattr(s, 'name', s.__class__.__name__) for s in strategies]}"
-    )
-
-    results, price_history, bt_cfg = run_backtests_for_strategies(
-        strategies=strategies,
-        defaults=defaults,
-        data_service=data_service,
-        backtester=backtester,
-    )
+def report_results(
+    results: Dict[str, Any], universe: PreparedUniverse, defaults: AnalysisDefaults
+) -> None:
+    price_history = universe.price_history
+    bt_cfg = universe.bt_cfg
 
     # Print metrics
     for name, res in results.items():
         print_metrics(name, res)
 
     # Benchmark series for plotting
-    bench_series = build_benchmark_series(price_history, bt_cfg)
+    bench_series = build_benchmark_series(universe.close_panel, bt_cfg)
     if bench_series is not None:
         # Name for legend context
         bench_series.name = bt_cfg.benchmark
 
     # Baseline (buy & hold initial weights across universe)
     baseline_series = compute_baseline_series(
-        price_history=price_history,
+        close_panel=universe.close_panel,
         bt_cfg=bt_cfg,
-        universe_symbols=defaults.symbols,
+        universe_symbols=list(universe.symbols),
     )
     if baseline_series is not None and baseline_series.name is None:
         baseline_series.name = "Baseline (Buy & Hold)"
@@ -1182,16 +1249,51 @@ def main():
         plot_trade_markers(res, price_history, title=name)
 
     # Ending normalized values quick glance
-    print("Ending normalized values:")
+    lines = ["Ending normalized values:"]
     for name, res in results.items():
         s = normalized_series(res.portfolio_values, res.timestamps)
-        print(f"{name}: {round(float(s.iloc[-1]), 4)}")
+        lines.append(f"{name}: {round(float(s.iloc[-1]), 4)}")
     if bench_series is not None and len(bench_series) > 1:
-        print(
+        lines.append(
             f"Benchmark ({bt_cfg.benchmark}): {round(float(bench_series.iloc[-1]), 4)}"
         )
     else:
-        print("Benchmark: n/a")
+        lines.append("Benchmark: n/a")
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
+def run_analysis(
+    strategies: Optional[List[Tuple[BaseStrategy, StrategyConfig]]] = None,
+    defaults: Optional[AnalysisDefaults] = None,
+    data_service: Optional[YFinanceDataService] = None,
+) -> Dict[str, Any]:
+    """
+    Backtest the given (strategy, config) pairs on the shared prepared universe
+    and report the results. Discovers all strategies when none are given.
+    """
+    defaults = defaults or default_settings()
+    data_service = data_service or YFinanceDataService()
+    backtester = BacktestingService(data_service)
+
+    if strategies is None:
+        discovered = discover_strategies()
+        if not discovered:
+            raise RuntimeError(
+                "No strategies discovered. Ensure they subclass BaseStrategy and are importable."
+            )
+        print(
+            f"Discovered strategies: {[getattr(s, 'name', s.__class__.__name__) for s in discovered]}"
+        )
+        strategies = [(s, build_strategy_config(s, defaults)) for s in discovered]
+
+    universe = prepare_universe(defaults, data_service)
+    results = run_backtests_for_strategies(strategies, universe, backtester)
+    report_results(results, universe, defaults)
+    return results
+
+
+def main():
+    run_analysis()
 
 
 if __name__ == "__main__":
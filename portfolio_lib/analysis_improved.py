@@ -0,0 +1,32 @@
+# %%
+"""
+Bollinger + Momentum comparison on top of the unified analysis runner.
+
+Thin wrapper around analysis.run_analysis: the universe, backtest window and
+price history are prepared once (and memoized), so running this after
+analysis.main() in the same notebook does not refetch or realign data.
+"""
+
+from typing import Any, Dict, Optional
+
+from analysis import (
+    AnalysisDefaults,
+    build_strategy_config,
+    default_settings,
+    run_analysis,
+)
+from portfolio_lib.services.strategy.bollinger import BollingerAttractivenessStrategy
+from portfolio_lib.services.strategy.momentum import MomentumStrategy
+
+
+def run_enhanced_analysis(defaults: Optional[AnalysisDefaults] = None) -> Dict[str, Any]:
+    defaults = defaults or default_settings()
+    strategies = [BollingerAttractivenessStrategy(), MomentumStrategy()]
+    return run_analysis(
+        strategies=[(s, build_strategy_config(s, defaults)) for s in strategies],
+        defaults=defaults,
+    )
+
+
+if __name__ == "__main__":
+    run_enhanced_analysis()
@@ -15,7 +15,6 @@ from .models.portfolio import Portfolio
 from .models.market_data import PriceData, MarketData, RiskMetrics, PerformanceMetrics
 from .models.strategy import StrategyConfig, BacktestConfig, StrategyResult, BacktestResult
 from .services.data.base import DataService
-from .services.data.yfinance import YFinanceDataService
 
 # Version information
 __version__ = "0.1.0"
@@ -40,3 +39,12 @@ __all__ = [
     "DataService",
     "YFinanceDataService",
 ]
+
+
+def __getattr__(name: str):
+    # Data providers load on first access; see portfolio_lib.services.data
+    if name == "YFinanceDataService":
+        from .services.data import YFinanceDataService
+
+        return YFinanceDataService
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -7,17 +7,79 @@ to allow for flexible data provider integration.
 """
 
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from pathlib import Path
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Dict, List, Mapping, Optional, Tuple, Union
 import pandas as pd
 import numpy as np
 
 from ..services.data.base import DataService
+from ..services.data.cache import ParquetCache, fetch_price_history_cached, store_price_history
+from ..utils.jit import NUMBA_AVAILABLE, njit
 from .market_data import RiskMetrics, PerformanceMetrics
 from .strategy import StrategyConfig, BacktestConfig, StrategyResult, BacktestResult
 
+if TYPE_CHECKING:
+    from ..services.strategy import StrategyProtocol, StrategyService
+
 logger = logging.getLogger(__name__)
 
+# How long fetched current prices are reused before refetching
+_PRICE_CACHE_TTL_SECONDS = 300.0
+
+
+@njit(cache=True)
+def _max_drawdown_nb(returns: np.ndarray) -> float:
+    """Single fused pass over simple returns: compound, track peak, keep worst drawdown."""
+    cum = 1.0
+    peak = -np.inf
+    max_dd = 0.0
+    for r in returns:
+        cum *= 1.0 + r
+        if cum > peak:
+            peak = cum
+        dd = (peak - cum) / peak
+        if dd > max_dd:
+            max_dd = dd
+    return max_dd
+
+
+# Strategies are stateless between calls, so one instance per name is shared process-wide
+_STRATEGY_REGISTRY: Dict[str, "StrategyProtocol"] = {}
+_STRATEGY_SERVICE: Optional["StrategyService"] = None
+
+
+def _get_strategy_registry() -> Dict[str, "StrategyProtocol"]:
+    """Built-in strategies by name, instantiated on first use."""
+    if not _STRATEGY_REGISTRY:
+        # Import here to avoid circular imports
+        from ..services.strategy import (
+            MomentumStrategy,
+            BollingerAttractivenessStrategy,
+            MLAttractivenessStrategy,
+        )
+        _STRATEGY_REGISTRY.update({
+            "momentum": MomentumStrategy(),
+            "bollinger": BollingerAttractivenessStrategy(),
+            "ml_attractiveness": MLAttractivenessStrategy(),
+        })
+    return _STRATEGY_REGISTRY
+
+
+def _get_strategy_service() -> "StrategyService":
+    """Shared StrategyService with the built-in strategies registered."""
+    global _STRATEGY_SERVICE
+    if _STRATEGY_SERVICE is None:
+        from ..services.strategy import StrategyService
+        service = StrategyService()
+        for name, strategy in _get_strategy_registry().items():
+            service.register_strategy(name, strategy)
+        _STRATEGY_SERVICE = service
+    return _STRATEGY_SERVICE
+
 
 class Portfolio:
     """
@@ -36,7 +98,8 @@ class Portfolio:
         name: str,
         holdings: Dict[str, float],
         data_service: DataService,
-        created_at: Optional[datetime] = None
+        created_at: Optional[datetime] = None,
+        cache_dir: Optional[Union[str, Path]] = None
     ):
         """
         Initialize a Portfolio.
@@ -46,21 +109,44 @@ class Portfolio:
             holdings: Dictionary of symbol -> shares
             data_service: Injected data service for market data
             created_at: Portfolio creation timestamp (defaults to now)
+            cache_dir: Optional directory for persisting fetched price history
+                across processes (parquet, requires pyarrow or fastparquet); later
+                fetches only request the symbols and recent days it lacks
         """
         self.name = name
-        self.holdings = holdings.copy()
+        self._holdings = holdings.copy()
         self.data_service = data_service
         self.created_at = created_at or datetime.now()
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self._disk_cache = ParquetCache(self.cache_dir) if self.cache_dir is not None else None
         
         # Cached data
         self._price_history: Optional[Dict[str, pd.DataFrame]] = None
         self._current_prices: Optional[Dict[str, float]] = None
-        self._last_data_update: Optional[datetime] = None
+        self._last_data_update: Optional[datetime] = None  # wall clock, for display
+        self._last_data_update_monotonic: Optional[float] = None  # for cache freshness
+        # Holdings as parallel arrays, plus current prices aligned to them (0.0 if unpriced)
+        self._symbols: List[str] = []
+        self._shares: np.ndarray = np.empty(0, dtype=np.float64)
+        self._prices_arr: np.ndarray = np.empty(0, dtype=np.float64)
+        # Aligned close frame and matrix (SoA), tied to the price history they came from
+        self._aligned_source: Optional[Dict[str, pd.DataFrame]] = None
+        self._aligned_prices: Optional[pd.DataFrame] = None
+        self._closes_source: Optional[Dict[str, pd.DataFrame]] = None
+        self._hist_symbols: List[str] = []
+        self._hist_index: pd.DatetimeIndex = pd.DatetimeIndex([])
+        self._closes_np: np.ndarray = np.empty((0, 0), dtype=np.float32)
+        # Valuation memo, valid until prices are refreshed or holdings change
+        self._cached_total_value: Optional[float] = None
+        self._cached_weights: Optional[Dict[str, float]] = None
+        self._cached_metrics: Optional[Tuple[RiskMetrics, PerformanceMetrics]] = None
+        self._backtesting_service = None
         
         logger.info(f"Created portfolio '{name}' with {len(holdings)} holdings")
         
         # Validate initial holdings
         self._validate_holdings()
+        self._sync_arrays()
     
     def _validate_holdings(self) -> None:
         """Validate portfolio holdings."""
@@ -74,6 +160,31 @@ class Portfolio:
             if not isinstance(shares, (int, float)) or shares <= 0:
                 raise ValueError(f"Invalid shares for {symbol}: {shares}")
     
+    @property
+    def holdings(self) -> Mapping[str, float]:
+        """
+        Read-only symbol -> shares mapping.
+        
+        Change holdings through add_holding, set_holdings, remove_holding or by
+        assigning a new mapping, so the cached valuation stays in sync.
+        """
+        return MappingProxyType(self._holdings)
+    
+    @holdings.setter
+    def holdings(self, holdings: Dict[str, float]) -> None:
+        previous = self._holdings
+        self._holdings = dict(holdings)
+        try:
+            self._validate_holdings()
+        except ValueError:
+            self._holdings = previous
+            raise
+        # Clear cached data since holdings changed
+        self._clear_price_history()
+        self._current_prices = None
+        self._invalidate_valuation()
+        self._sync_arrays()
+    
     @property
     def symbols(self) -> List[str]:
         """Get list of symbols in the portfolio."""
@@ -87,16 +198,10 @@ class Portfolio:
         Returns:
             Total portfolio value in USD
         """
-        current_prices = self._get_current_prices()
-        
-        total = 0.0
-        for symbol, shares in self.holdings.items():
-            if symbol in current_prices:
-                total += shares * current_prices[symbol]
-            else:
-                logger.warning(f"No current price available for {symbol}")
-        
-        return total
+        self._get_current_prices()
+        if self._cached_total_value is None:
+            self._cached_total_value = float(np.vdot(self._shares, self._prices_arr))
+        return self._cached_total_value
     
     @property
     def current_weights(self) -> Dict[str, float]:
@@ -106,22 +211,17 @@ class Portfolio:
         Returns:
             Dictionary mapping symbols to their weight (0-1)
         """
-        current_prices = self._get_current_prices()
-        total_value = self.total_value
-        
-        if total_value <= 0:
-            logger.warning("Portfolio has zero or negative value")
-            return {symbol: 0.0 for symbol in self.symbols}
-        
-        weights = {}
-        for symbol, shares in self.holdings.items():
-            if symbol in current_prices:
-                value = shares * current_prices[symbol]
-                weights[symbol] = value / total_value
-            else:
-                weights[symbol] = 0.0
-        
-        return weights
+        self._get_current_prices()
+        if self._cached_weights is None:
+            total_value = self.total_value
+            
+            if total_value <= 0:
+                logger.warning("Portfolio has zero or negative value")
+                return {symbol: 0.0 for symbol in self.symbols}
+            
+            values = self._shares * self._prices_arr
+            self._cached_weights = dict(zip(self._symbols, (values / total_value).tolist()))
+        return dict(self._cached_weights)
     
     @property
     def risk_metrics(self) -> RiskMetrics:
@@ -131,41 +231,7 @@ class Portfolio:
         Returns:
             RiskMetrics object with volatility, Sharpe ratio, etc.
         """
-        price_history = self._get_price_history()
-        
-        if not price_history:
-            logger.warning("No price history available for risk calculation")
-            return RiskMetrics(
-                volatility=0.0,
-                sharpe_ratio=0.0,
-                max_drawdown=0.0,
-                var_95=0.0
-            )
-        
-        # Calculate portfolio returns
-        portfolio_returns = self._calculate_portfolio_returns(price_history)
-        
-        if portfolio_returns.empty:
-            logger.warning("No returns data available")
-            return RiskMetrics(
-                volatility=0.0,
-                sharpe_ratio=0.0,
-                max_drawdown=0.0,
-                var_95=0.0
-            )
-        
-        # Calculate metrics
-        volatility = portfolio_returns.std() * np.sqrt(252)  # Annualized
-        sharpe_ratio = (portfolio_returns.mean() * 252) / volatility if volatility > 0 else 0.0
-        max_drawdown = self._calculate_max_drawdown(portfolio_returns)
-        var_95 = np.percentile(portfolio_returns, 5)  # 95% VaR
-        
-        return RiskMetrics(
-            volatility=volatility,
-            sharpe_ratio=sharpe_ratio,
-            max_drawdown=max_drawdown,
-            var_95=var_95
-        )
+        return self._compute_all_metrics()[0]
     
     @property
     def performance_metrics(self) -> PerformanceMetrics:
@@ -175,40 +241,75 @@ class Portfolio:
         Returns:
             PerformanceMetrics object with returns and performance data
         """
+        return self._compute_all_metrics()[1]
+    
+    def _compute_all_metrics(self) -> Tuple[RiskMetrics, PerformanceMetrics]:
+        """
+        Compute risk and performance metrics from a single returns pass.
+        
+        Cached until prices are refreshed or holdings change.
+        """
+        # Weights come from current prices; an expired price cache must invalidate the memo
+        self._get_current_prices()
+        if self._cached_metrics is not None:
+            return self._cached_metrics
+        
         price_history = self._get_price_history()
         
         if not price_history:
-            logger.warning("No price history available for performance calculation")
-            return PerformanceMetrics(
-                total_return=0.0,
-                annualized_return=0.0,
-                cumulative_return=0.0
-            )
+            logger.warning("No price history available for metrics calculation")
+            return self._empty_metrics()
         
-        portfolio_returns = self._calculate_portfolio_returns(price_history)
+        # Calculate portfolio returns with weights resolved once up front
+        weights = self.current_weights
+        _, r = self._portfolio_return_array(price_history, weights)
         
-        if portfolio_returns.empty:
-            return PerformanceMetrics(
+        if r.size == 0:
+            logger.warning("No returns data available")
+            return self._empty_metrics()
+        
+        days = len(r)
+        
+        # Risk metrics
+        volatility = float(r.std(ddof=1)) * np.sqrt(252) if days > 1 else float("nan")  # Annualized
+        sharpe_ratio = (float(r.mean()) * 252) / volatility if volatility > 0 else 0.0
+        max_drawdown = self._calculate_max_drawdown(r)
+        var_95 = float(np.percentile(r, 5))  # 95% VaR
+        
+        # Performance metrics
+        cumulative_return = float(np.prod(1.0 + r)) - 1.0
+        annualized_return = (1 + cumulative_return) ** (252 / days) - 1
+        
+        self._cached_metrics = (
+            RiskMetrics(
+                volatility=volatility,
+                sharpe_ratio=sharpe_ratio,
+                max_drawdown=max_drawdown,
+                var_95=var_95
+            ),
+            PerformanceMetrics(
+                total_return=cumulative_return,
+                annualized_return=annualized_return,
+                cumulative_return=cumulative_return
+            ),
+        )
+        return self._cached_metrics
+    
+    @staticmethod
+    def _empty_metrics() -> Tuple[RiskMetrics, PerformanceMetrics]:
+        """Zeroed metrics for portfolios without usable price history."""
+        return (
+            RiskMetrics(
+                volatility=0.0,
+                sharpe_ratio=0.0,
+                max_drawdown=0.0,
+                var_95=0.0
+            ),
+            PerformanceMetrics(
                 total_return=0.0,
                 annualized_return=0.0,
                 cumulative_return=0.0
-            )
-        
-        # Calculate performance metrics
-        cumulative_return = (1 + portfolio_returns).prod() - 1
-        total_return = cumulative_return
-        
-        # Annualized return
-        days = len(portfolio_returns)
-        if days > 0:
-            annualized_return = (1 + cumulative_return) ** (252 / days) - 1
-        else:
-            annualized_return = 0.0
-        
-        return PerformanceMetrics(
-            total_return=total_return,
-            annualized_return=annualized_return,
-            cumulative_return=cumulative_return
+            ),
         )
     
     def refresh_data(self) -> None:
@@ -216,12 +317,44 @@ class Portfolio:
         logger.info(f"Refreshing data for portfolio '{self.name}'")
         
         # Clear cached data
-        self._price_history = None
+        self._clear_price_history()
         self._current_prices = None
         self._last_data_update = None
-        
-        # Pre-fetch current prices to warm the cache
-        self._get_current_prices()
+        self._last_data_update_monotonic = None
+        self._invalidate_valuation()
+        if self._backtesting_service is not None:
+            self._backtesting_service.clear_cache()
+        
+        # Warm both caches; the two fetches are independent I/O, so overlap them
+        symbols = self.symbols
+        start_date, end_date = self._history_window()
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            prices_future = pool.submit(self.data_service.fetch_current_prices, symbols)
+            history_future = pool.submit(
+                self.data_service.fetch_price_history, symbols, start_date, end_date
+            )
+            
+            try:
+                self._current_prices = prices_future.result()
+                self._mark_prices_updated()
+            except Exception as e:
+                logger.error(f"Error fetching current prices: {e}")
+                self._current_prices = {}
+            self._index_current_prices()
+            
+            try:
+                self._price_history = history_future.result()
+                if self._disk_cache is not None:
+                    store_price_history(
+                        self._disk_cache,
+                        self.data_service.get_data_source_name(),
+                        self._price_history,
+                        start_date,
+                        end_date,
+                    )
+            except Exception as e:
+                logger.error(f"Error fetching price history: {e}")
+                self._price_history = {}
         
         logger.info("Data refresh completed")
     
@@ -239,14 +372,43 @@ class Portfolio:
         if not isinstance(shares, (int, float)) or shares <= 0:
             raise ValueError(f"Invalid shares: {shares}")
         
-        self.holdings[symbol] = shares
+        self._holdings[symbol] = shares
         
         # Clear cached data since holdings changed
-        self._price_history = None
+        self._clear_price_history()
         self._current_prices = None
+        self._invalidate_valuation()
+        self._sync_arrays()
         
         logger.info(f"Added {shares} shares of {symbol} to portfolio '{self.name}'")
     
+    def set_holdings(self, updates: Dict[str, float]) -> None:
+        """
+        Add or update several holdings at once.
+        
+        All entries are validated before any is applied, and caches are
+        cleared a single time for the whole batch.
+        
+        Args:
+            updates: Dictionary of symbol -> shares to merge into the holdings
+        """
+        for symbol, shares in updates.items():
+            if not isinstance(symbol, str) or not symbol.strip():
+                raise ValueError(f"Invalid symbol: {symbol}")
+            
+            if not isinstance(shares, (int, float)) or shares <= 0:
+                raise ValueError(f"Invalid shares for {symbol}: {shares}")
+        
+        self._holdings.update(updates)
+        
+        # Clear cached data since holdings changed
+        self._clear_price_history()
+        self._current_prices = None
+        self._invalidate_valuation()
+        self._sync_arrays()
+        
+        logger.info(f"Updated {len(updates)} holdings in portfolio '{self.name}'")
+    
     def remove_holding(self, symbol: str) -> None:
         """
         Remove a holding from the portfolio.
@@ -257,11 +419,13 @@ class Portfolio:
         if symbol not in self.holdings:
             raise ValueError(f"Symbol {symbol} not found in portfolio")
         
-        del self.holdings[symbol]
+        del self._holdings[symbol]
         
         # Clear cached data since holdings changed
-        self._price_history = None
+        self._clear_price_history()
         self._current_prices = None
+        self._invalidate_valuation()
+        self._sync_arrays()
         
         logger.info(f"Removed {symbol} from portfolio '{self.name}'")
     
@@ -278,19 +442,7 @@ class Portfolio:
         """
         logger.info(f"Running strategy '{strategy_name}' on portfolio '{self.name}'")
         
-        # Import here to avoid circular imports
-        from ..services.strategy import (
-            StrategyService,
-            MomentumStrategy,
-            BollingerAttractivenessStrategy,
-            MLAttractivenessStrategy,
-        )
-        
-        # Create strategy service and register available strategies
-        strategy_service = StrategyService()
-        strategy_service.register_strategy("momentum", MomentumStrategy())
-        strategy_service.register_strategy("bollinger", BollingerAttractivenessStrategy())
-        strategy_service.register_strategy("ml_attractiveness", MLAttractivenessStrategy())
+        strategy_service = _get_strategy_service()
         
         key = strategy_name.lower()
         available = strategy_service.get_available_strategies()
@@ -324,26 +476,13 @@ class Portfolio:
         """
         logger.info(f"Running backtest '{strategy_name}' on portfolio '{self.name}'")
         
-        # Import here to avoid circular imports
-        from ..services.strategy import (
-            MomentumStrategy,
-            BollingerAttractivenessStrategy,
-            MLAttractivenessStrategy,
-        )
-        from ..services.backtesting.backtester import BacktestingService
-        from .strategy import StrategyConfig
-        
-        # Strategy factory
+        # Strategy lookup from the shared registry
         strategy_key = strategy_name.lower()
-        strategy_factory = {
-            "momentum": MomentumStrategy,
-            "bollinger": BollingerAttractivenessStrategy,
-            "ml_attractiveness": MLAttractivenessStrategy,
-        }
-        if strategy_key not in strategy_factory:
-            raise ValueError(f"Unknown strategy: {strategy_name}. Available strategies: {list(strategy_factory.keys())}")
+        registry = _get_strategy_registry()
+        if strategy_key not in registry:
+            raise ValueError(f"Unknown strategy: {strategy_name}. Available strategies: {list(registry.keys())}")
         
-        strategy = strategy_factory[strategy_key]()
+        strategy = registry[strategy_key]
         
         # Create strategy config from backtest config parameters if available
         strategy_config = StrategyConfig(
@@ -354,17 +493,26 @@ class Portfolio:
             max_position_size=getattr(config, "max_position_size", 0.3)
         )
         
-        # Create backtesting service
-        backtesting_service = BacktestingService(self.data_service)
+        # Reuse the backtesting service while the data service is unchanged
+        backtesting_service = self._get_backtesting_service()
         
         # Run backtest
         return backtesting_service.run_backtest(
             strategy,
             strategy_config,
             config,
-            self.holdings
+            dict(self._holdings)
         )
     
+    def _get_backtesting_service(self):
+        """Backtesting service bound to this portfolio's data service, created once."""
+        if (self._backtesting_service is None
+                or self._backtesting_service.data_service is not self.data_service):
+            # Import here to avoid circular imports
+            from ..services.backtesting.backtester import BacktestingService
+            self._backtesting_service = BacktestingService(self.data_service)
+        return self._backtesting_service
+    
     def get_position_values(self) -> Dict[str, float]:
         """
         Get current value of each position.
@@ -372,51 +520,79 @@ class Portfolio:
         Returns:
             Dictionary mapping symbols to their current value
         """
-        current_prices = self._get_current_prices()
-        
-        values = {}
-        for symbol, shares in self.holdings.items():
-            if symbol in current_prices:
-                values[symbol] = shares * current_prices[symbol]
-            else:
-                values[symbol] = 0.0
-        
-        return values
+        self._get_current_prices()
+        return dict(zip(self._symbols, (self._shares * self._prices_arr).tolist()))
     
     def _get_current_prices(self) -> Dict[str, float]:
         """Get current prices, using cache if available."""
         # Use cached data if it's recent (within 5 minutes)
         if (self._current_prices is not None and 
-            self._last_data_update is not None and
-            datetime.now() - self._last_data_update < timedelta(minutes=5)):
+            self._last_data_update_monotonic is not None and
+            time.monotonic() - self._last_data_update_monotonic < _PRICE_CACHE_TTL_SECONDS):
             return self._current_prices
         
         # Fetch fresh data
         try:
             self._current_prices = self.data_service.fetch_current_prices(self.symbols)
-            self._last_data_update = datetime.now()
+            self._mark_prices_updated()
             logger.debug(f"Fetched current prices for {len(self._current_prices)} symbols")
         except Exception as e:
             logger.error(f"Error fetching current prices: {e}")
             self._current_prices = {}
         
+        self._index_current_prices()
         return self._current_prices or {}
     
+    def _mark_prices_updated(self) -> None:
+        """Stamp a successful current-price fetch."""
+        self._last_data_update = datetime.now()
+        self._last_data_update_monotonic = time.monotonic()
+    
+    def _index_current_prices(self) -> None:
+        """Align the cached current prices to the holdings once per price refresh."""
+        prices = self._current_prices or {}
+        for symbol in self._symbols:
+            if symbol not in prices:
+                logger.warning(f"No current price available for {symbol}")
+        self._prices_arr = np.fromiter(
+            (prices.get(s, 0.0) for s in self._symbols), dtype=np.float64, count=len(self._symbols)
+        )
+        self._invalidate_valuation()
+    
+    def _sync_arrays(self) -> None:
+        """Rebuild the (symbols, shares) arrays after holdings change."""
+        self._symbols = list(self._holdings)
+        self._shares = np.fromiter(
+            self._holdings.values(), dtype=np.float64, count=len(self._symbols)
+        )
+        if self._current_prices is not None:
+            self._index_current_prices()
+    
+    def _invalidate_valuation(self) -> None:
+        """Drop memoized total value, weights and the metrics derived from them."""
+        self._cached_total_value = None
+        self._cached_weights = None
+        self._cached_metrics = None
+    
     def _get_price_history(self, days: int = 252) -> Dict[str, pd.DataFrame]:
         """Get price history, using cache if available."""
         if self._price_history is not None:
             return self._price_history
         
-        # Calculate date range
-        end_date = datetime.now()
-        start_date = end_date - timedelta(days=days)
+        start_date, end_date = self._history_window(days)
         
         try:
-            self._price_history = self.data_service.fetch_price_history(
-                self.symbols,
-                start_date.strftime('%Y-%m-%d'),
-                end_date.strftime('%Y-%m-%d')
-            )
+            if self._disk_cache is not None:
+                # Reuse what earlier runs persisted; only missing symbols and days are fetched
+                self._price_history = fetch_price_history_cached(
+                    self.data_service, self._disk_cache, self.symbols, start_date, end_date
+                )
+            else:
+                self._price_history = self.data_service.fetch_price_history(
+                    self.symbols,
+                    start_date,
+                    end_date
+                )
             logger.debug(f"Fetched price history for {len(self._price_history)} symbols")
         except Exception as e:
             logger.error(f"Error fetching price history: {e}")
@@ -424,74 +600,148 @@ class Portfolio:
         
         return self._price_history or {}
     
-    def _calculate_portfolio_returns(self, price_history: Dict[str, pd.DataFrame]) -> pd.Series:
-        """Calculate portfolio returns from price history."""
-        if not price_history:
-            return pd.Series(dtype=float)
-        
-        # Get aligned price data
-        aligned_prices = self._align_price_data(price_history)
+    def _history_window(self, days: int = 252) -> Tuple[str, str]:
+        """Return the (start, end) date strings for a trailing history window."""
+        end_date = datetime.now()
+        start_date = end_date - timedelta(days=days)
+        return start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d')
+    
+    def _calculate_portfolio_returns(
+        self,
+        price_history: Dict[str, pd.DataFrame],
+        weights: Optional[Dict[str, float]] = None
+    ) -> pd.Series:
+        """
+        Calculate portfolio returns from price history.
         
-        if aligned_prices.empty:
+        Args:
+            price_history: Per-symbol OHLCV frames
+            weights: Symbol -> weight to apply; defaults to current_weights. Pass
+                precomputed weights to avoid a current-price lookup.
+        """
+        if not price_history:
             return pd.Series(dtype=float)
         
-        # Calculate portfolio values over time
-        weights = self.current_weights
-        portfolio_values = pd.Series(0.0, index=aligned_prices.index)
-        
-        for symbol in self.symbols:
-            if symbol in aligned_prices.columns and symbol in weights:
-                portfolio_values += weights[symbol] * aligned_prices[symbol]
-        
-        # Calculate returns
-        portfolio_returns = portfolio_values.pct_change().dropna()
+        if weights is None:
+            weights = self.current_weights
+        dates, returns = self._portfolio_return_array(price_history, weights)
+        return pd.Series(returns, index=dates)
+    
+    def _portfolio_return_array(
+        self,
+        price_history: Dict[str, pd.DataFrame],
+        weights: Dict[str, float]
+    ) -> Tuple[pd.DatetimeIndex, np.ndarray]:
+        """Portfolio simple returns as a float64 array plus their dates (no pandas ops)."""
+        # Get aligned (T x N) close matrix
+        symbols, dates, closes = self._get_close_matrix(price_history)
+        
+        if closes.shape[0] == 0 or closes.shape[1] == 0:
+            return pd.DatetimeIndex([]), np.empty(0, dtype=np.float64)
+        
+        # Calculate portfolio values over time: one (T x N) @ (N,) product
+        w = np.array([weights.get(s, 0.0) for s in symbols], dtype=closes.dtype)
+        # float32 product over the stored matrix; returns are taken in float64
+        portfolio_values = (closes @ w).astype(np.float64)
+        
+        # Exact simple returns (pct_change semantics: NaN steps are dropped)
+        returns = portfolio_values[1:] / portfolio_values[:-1]
+        returns -= 1.0
+        valid = ~np.isnan(returns)
+        if valid.all():
+            # Usual case for the forward-filled matrix: no compress copies needed
+            return dates[1:], returns
+        
+        return dates[1:][valid], returns[valid]
+    
+    def _get_close_matrix(
+        self, price_history: Dict[str, pd.DataFrame]
+    ) -> Tuple[List[str], pd.DatetimeIndex, np.ndarray]:
+        """
+        Return the aligned price history as (symbols, dates, closes[T, N]).
         
-        return portfolio_returns
+        Built once per fetched price history and reused until it is replaced.
+        """
+        if self._closes_source is not price_history:
+            aligned = self._align_price_data(price_history)
+            self._hist_symbols = list(aligned.columns)
+            self._hist_index = aligned.index
+            # Metrics only need ~7 significant digits of price; float32 halves the block
+            self._closes_np = np.ascontiguousarray(aligned.to_numpy(dtype=np.float32))
+            self._closes_source = price_history
+        # JIT kernels and BLAS consumers rely on C order at this boundary
+        assert self._closes_np.flags.c_contiguous
+        return self._hist_symbols, self._hist_index, self._closes_np
+    
+    def _clear_price_history(self) -> None:
+        """Drop the cached price history and everything derived from it."""
+        self._price_history = None
+        self._cached_metrics = None
+        self._aligned_source = None
+        self._aligned_prices = None
+        self._closes_source = None
+        self._hist_symbols = []
+        self._hist_index = pd.DatetimeIndex([])
+        self._closes_np = np.empty((0, 0), dtype=np.float32)
     
     def _align_price_data(self, price_history: Dict[str, pd.DataFrame]) -> pd.DataFrame:
-        """Align price data across all symbols."""
+        """Align price data across all symbols (cached per price history object)."""
+        if self._aligned_prices is not None and self._aligned_source is price_history:
+            return self._aligned_prices
+        
+        aligned = self._build_aligned_prices(price_history)
+        self._aligned_prices = aligned
+        self._aligned_source = price_history
+        return aligned
+    
+    def _build_aligned_prices(self, price_history: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+        """Outer-join close prices, forward fill and drop leading gaps."""
         if not price_history:
             return pd.DataFrame()
         
         # Extract close prices for each symbol
-        close_prices = {}
-        for symbol, df in price_history.items():
-            if 'close' in df.columns:
-                close_prices[symbol] = df['close']
+        closes = [
+            df['close'].rename(symbol)
+            for symbol, df in price_history.items()
+            if 'close' in df.columns
+        ]
         
-        if not close_prices:
+        if not closes:
             return pd.DataFrame()
         
-        # Combine into single DataFrame
-        aligned = pd.DataFrame(close_prices)
+        # Combine into single DataFrame with one outer join across all indices
+        aligned = pd.concat(closes, axis=1, join='outer', sort=True)
         
         # Forward fill missing values
         aligned = aligned.ffill().dropna()
         
         return aligned
     
-    def _calculate_max_drawdown(self, returns: pd.Series) -> float:
-        """Calculate maximum drawdown from returns series."""
-        if returns.empty:
+    def _calculate_max_drawdown(self, returns: Union[pd.Series, np.ndarray]) -> float:
+        """Calculate maximum drawdown from a returns series or float array."""
+        r = np.ascontiguousarray(returns, dtype=np.float64)
+        if r.size == 0:
             return 0.0
         
-        # Calculate cumulative returns
-        cumulative = (1 + returns).cumprod()
-        
-        # Calculate running maximum
-        running_max = cumulative.expanding().max()
+        if NUMBA_AVAILABLE:
+            return float(_max_drawdown_nb(r))
         
-        # Calculate drawdown
-        drawdown = (cumulative - running_max) / running_max
+        # Cumulative growth, running peak and drawdown as plain ufunc passes; the
+        # growth buffer is reused in place for the drawdown
+        drawdown = np.add(r, 1.0)
+        np.cumprod(drawdown, out=drawdown)
+        running_max = np.maximum.accumulate(drawdown)
+        np.subtract(drawdown, running_max, out=drawdown)
+        np.divide(drawdown, running_max, out=drawdown)
         
         # Return maximum drawdown (most negative value)
-        return abs(drawdown.min())
+        return float(abs(drawdown.min()))
     
     def to_dict(self) -> Dict:
         """Convert portfolio to dictionary for serialization."""
         return {
             'name': self.name,
-            'holdings': self.holdings,
+            'holdings': dict(self._holdings),
             'created_at': self.created_at.isoformat(),
             'total_value': self.total_value,
             'current_weights': self.current_weights,
@@ -8,8 +8,12 @@ and backtesting outcomes.
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
+from functools import cached_property
 from typing import Any, Dict, List, Optional
 
+import numpy as np
+import pandas as pd
+
 
 class TradeAction(Enum):
     """Trade action types."""
@@ -19,6 +23,10 @@ class TradeAction(Enum):
     HOLD = "hold"
 
 
+# Serialized form of each action, resolved once instead of per trade
+_ACTION_VALUES: Dict[TradeAction, str] = {action: action.value for action in TradeAction}
+
+
 @dataclass
 class Trade:
     """Individual trade recommendation or execution."""
@@ -66,6 +74,9 @@ class BacktestConfig:
     commission: float = 0.001  # 0.1% commission per trade
     slippage: float = 0.0005  # 0.05% slippage
     benchmark: str = "SPY"  # Benchmark symbol for comparison
+    # Keep per-rebalance weights, targets, scores and trades in
+    # BacktestResult.rebalance_details; off by default to save memory
+    capture_diagnostics: bool = False
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for API serialization."""
@@ -76,6 +87,7 @@ class BacktestConfig:
             "commission": self.commission,
             "slippage": self.slippage,
             "benchmark": self.benchmark,
+            "capture_diagnostics": self.capture_diagnostics,
         }
 
 
@@ -92,30 +104,53 @@ class StrategyResult:
     # Optional per-symbol diagnostic scores/signals used to build weights
     scores: Dict[str, float] = field(default_factory=dict)
 
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary for API serialization."""
+    def to_dict(self, columnar_trades: bool = False) -> Dict[str, Any]:
+        """
+        Convert to dictionary for API serialization.
+
+        Args:
+            columnar_trades: Emit ``trades`` as parallel lists keyed by field
+                (symbol, action, quantity, price, timestamp, reason) instead of
+                one dict per trade. Cheaper to build and encode for large trade lists.
+        """
         return {
             "strategy_name": self.strategy_name,
             "timestamp": self.timestamp.isoformat(),
-            "trades": [
-                {
-                    "symbol": trade.symbol,
-                    "action": trade.action.value,
-                    "quantity": trade.quantity,
-                    "price": trade.price,
-                    "timestamp": trade.timestamp.isoformat()
-                    if trade.timestamp
-                    else None,
-                    "reason": trade.reason,
-                }
-                for trade in self.trades
-            ],
+            "trades": self._trades_columns() if columnar_trades else self._trades_records(),
             "expected_return": self.expected_return,
             "confidence": self.confidence,
             "new_weights": self.new_weights,
             "scores": self.scores,
         }
 
+    def _trades_columns(self) -> Dict[str, List[Any]]:
+        """Trades as a struct of arrays."""
+        trades = self.trades
+        return {
+            "symbol": [t.symbol for t in trades],
+            "action": [_ACTION_VALUES[t.action] for t in trades],
+            "quantity": [t.quantity for t in trades],
+            "price": [t.price for t in trades],
+            "timestamp": [t.timestamp.isoformat() if t.timestamp else None for t in trades],
+            "reason": [t.reason for t in trades],
+        }
+
+    def _trades_records(self) -> List[Dict[str, Any]]:
+        """Trades as one dict per trade."""
+        return [
+            {
+                "symbol": trade.symbol,
+                "action": _ACTION_VALUES[trade.action],
+                "quantity": trade.quantity,
+                "price": trade.price,
+                "timestamp": trade.timestamp.isoformat()
+                if trade.timestamp
+                else None,
+                "reason": trade.reason,
+            }
+            for trade in self.trades
+        ]
+
 
 @dataclass
 class BacktestResult:
@@ -147,14 +182,59 @@ class BacktestResult:
     daily_returns: List[float] = field(default_factory=list)
     portfolio_values: List[float] = field(default_factory=list)
     timestamps: List[datetime] = field(default_factory=list)
-    # Executed trades with metadata for plotting/analysis
-    executed_trades: List[Dict[str, Any]] = field(default_factory=list)
-    # Holdings per timestamp and optional rebalance details for richer analytics
-    holdings_history: List[Dict[str, float]] = field(default_factory=list)
+    # Executed trades as column arrays (symbol, action, sizes and costs, timestamp,
+    # reason, score; scores are masked where the strategy reported none), one row
+    # per trade in execution order. The only stored form: executed_trades is built
+    # from it on first access
+    executed_trades_columns: Optional[Dict[str, Any]] = field(
+        default=None, repr=False, compare=False
+    )
+    # Shares held per timestamp as a (days x holdings_symbols) matrix; NaN marks a
+    # symbol not yet held that day. The only stored form: holdings_history is built
+    # from it on first access
+    holdings_matrix: Optional[np.ndarray] = field(default=None, repr=False, compare=False)
+    holdings_symbols: List[str] = field(default_factory=list)
+    # With BacktestConfig.capture_diagnostics, rebalance details for richer analytics
     rebalance_details: List[Dict[str, Any]] = field(default_factory=list)
 
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary for API serialization."""
+    @cached_property
+    def holdings_history(self) -> List[Dict[str, float]]:
+        """Holdings (symbol -> shares) per timestamp; each day gets its own dict."""
+        if self.holdings_matrix is None:
+            return []
+        symbols = self.holdings_symbols
+        return [
+            {symbol: shares for symbol, shares in zip(symbols, row) if shares == shares}
+            for row in self.holdings_matrix.tolist()
+        ]
+
+    def holdings_frame(self) -> pd.DataFrame:
+        """Shares held per timestamp (rows) and symbol (columns); NaN where not held."""
+        if self.holdings_matrix is None:
+            return pd.DataFrame(index=pd.DatetimeIndex(self.timestamps))
+        return pd.DataFrame(
+            self.holdings_matrix,
+            index=pd.DatetimeIndex(self.timestamps),
+            columns=self.holdings_symbols,
+        )
+
+    @cached_property
+    def executed_trades(self) -> List[Dict[str, Any]]:
+        """Executed trades with metadata for plotting/analysis, one dict per trade."""
+        if self.executed_trades_columns is None:
+            return []
+        lists = _trade_column_lists(self.executed_trades_columns)
+        return [dict(zip(lists, row)) for row in zip(*lists.values())]
+
+    def to_dict(self, columnar_trades: bool = False) -> Dict[str, Any]:
+        """
+        Convert to dictionary for API serialization.
+
+        Args:
+            columnar_trades: Emit ``executed_trades`` as parallel lists keyed by
+                field instead of one dict per trade. Cheaper to encode and loads
+                column-wise into a DataFrame for trade analytics.
+        """
         return {
             "strategy_name": self.strategy_name,
             "config": self.config.to_dict(),
@@ -174,5 +254,43 @@ class BacktestResult:
             "daily_returns": self.daily_returns,
             "portfolio_values": self.portfolio_values,
             "timestamps": [ts.isoformat() for ts in self.timestamps],
-            "executed_trades": self.executed_trades,
+            "executed_trades": self._executed_trades_lists()
+            if columnar_trades
+            else self.executed_trades,
         }
+
+    def executed_trades_frame(self) -> pd.DataFrame:
+        """Executed trades as a DataFrame, one row per trade in execution order."""
+        if self.executed_trades_columns is not None:
+            return pd.DataFrame(self.executed_trades_columns)
+        return pd.DataFrame(self._executed_trades_columns())
+
+    def _executed_trades_lists(self) -> Dict[str, List[Any]]:
+        """Executed trades as a struct of lists, in execution order."""
+        if self.executed_trades_columns is not None:
+            return _trade_column_lists(self.executed_trades_columns)
+        return self._executed_trades_columns()
+
+    def _executed_trades_columns(self) -> Dict[str, List[Any]]:
+        """Executed trades as a struct of arrays rebuilt from the records (records-only results)."""
+        trades = self.executed_trades
+        fields = dict.fromkeys(key for trade in trades for key in trade)
+        return {key: [trade.get(key) for trade in trades] for key in fields}
+
+
+def _trade_column_lists(columns: Dict[str, Any]) -> Dict[str, List[Any]]:
+    """
+    Trade columns as plain lists, in column order.
+
+    Datetime arrays become ``pd.Timestamp`` values and masked entries None,
+    matching the per-trade records.
+    """
+    lists: Dict[str, List[Any]] = {}
+    for key, column in columns.items():
+        if isinstance(column, np.ndarray) and column.dtype.kind == "M":
+            lists[key] = pd.DatetimeIndex(column).tolist()
+        elif isinstance(column, np.ndarray):
+            lists[key] = column.tolist()
+        else:
+            lists[key] = list(column)
+    return lists
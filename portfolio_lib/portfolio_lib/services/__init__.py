@@ -3,9 +3,17 @@ Services package - Business logic and external service integrations.
 """
 
 from .data.base import DataService
-from .data.yfinance import YFinanceDataService
 
 __all__ = [
     "DataService",
     "YFinanceDataService",
 ]
+
+
+def __getattr__(name: str):
+    # Providers load on first access, through the lazy services.data package
+    if name == "YFinanceDataService":
+        from .data import YFinanceDataService
+
+        return YFinanceDataService
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,3 +1,3 @@
-from .backtester import BacktestingService
+from .backtester import BacktestingService, warm_up_kernels
 
-__all__ = ['BacktestingService']
+__all__ = ['BacktestingService', 'warm_up_kernels']
@@ -6,8 +6,15 @@ including performance metrics, risk analysis, and comparison to benchmarks.
 """
 
 import logging
-from datetime import datetime
-from typing import Dict, List, Optional
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
@@ -18,28 +25,367 @@ from portfolio_lib.models.strategy import (
     StrategyConfig,
     Trade,
     TradeAction,
+    _trade_column_lists,
 )
 from portfolio_lib.services.data.base import DataService
 from portfolio_lib.services.strategy.base import StrategyProtocol
+from portfolio_lib.utils.jit import NUMBA_AVAILABLE, njit
 
 logger = logging.getLogger(__name__)
 
+_REBALANCE_PERIODS = {"daily": "D", "weekly": "W", "monthly": "M", "quarterly": "Q"}
+
+# How long a cached market whose period reaches today is reused before refetching
+_MARKET_CACHE_TTL_SECONDS = 300.0
+
+_TRADE_ACTIONS = ("buy", "sell")
+_ACTION_CODES = {TradeAction.BUY: 0, TradeAction.SELL: 1}
+_TRADE_FLOAT_FIELDS = (
+    "quantity_shares",
+    "weight_fraction",
+    "price",
+    "gross_value",
+    "commission",
+    "slippage",
+    "total_cost",
+    "net_cash_delta",
+    "score",
+)
+
+
+@njit(cache=True)
+def _mark_to_market_nb(
+    prices: np.ndarray,
+    holdings: np.ndarray,
+    cash: float,
+    start: int,
+    stop: int,
+    out: np.ndarray,
+) -> None:
+    """Write cash + holdings . prices[t] into out[t] for t in [start, stop)."""
+    for t in range(start, stop):
+        invested = 0.0
+        for k in range(holdings.shape[0]):
+            invested += holdings[k] * prices[t, k]
+        out[t] = cash + invested
+
+
+@njit(cache=True)
+def _apply_trades_nb(
+    action_codes: np.ndarray,
+    symbol_codes: np.ndarray,
+    prices: np.ndarray,
+    dollar_values: np.ndarray,
+    shares: np.ndarray,
+    held: np.ndarray,
+    cash: float,
+    commission_rate: float,
+    slippage_rate: float,
+):
+    """
+    Apply sized trades in order against cash and ``held`` (updated in place).
+
+    Returns (filled mask, fill columns, cash), where the fill columns are shares,
+    gross value, commission, slippage, total cost and net cash delta per trade.
+    """
+    n = action_codes.shape[0]
+    filled = np.zeros(n, dtype=np.bool_)
+    fills = np.zeros((6, n), dtype=np.float64)
+    for k in range(n):
+        if not dollar_values[k] > 0.0:
+            continue
+        code = symbol_codes[k]
+        if action_codes[k] == 0:  # buy
+            gross = shares[k] * prices[k]
+            commission = gross * commission_rate
+            slippage = gross * slippage_rate
+            total_cost = commission + slippage
+            total_needed = gross + total_cost
+            if cash >= total_needed and shares[k] > 0.0:
+                held[code] = held[code] + shares[k]
+                cash -= total_needed
+                filled[k] = True
+                fills[0, k] = shares[k]
+                fills[1, k] = gross
+                fills[2, k] = commission
+                fills[3, k] = slippage
+                fills[4, k] = total_cost
+                fills[5, k] = -total_needed
+        elif action_codes[k] == 1:  # sell
+            current_shares = held[code]
+            to_sell = min(current_shares, shares[k])
+            if to_sell > 0.0:
+                gross = to_sell * prices[k]
+                commission = gross * commission_rate
+                slippage = gross * slippage_rate
+                total_cost = commission + slippage
+                proceeds = gross - total_cost
+                held[code] = current_shares - to_sell
+                cash += proceeds
+                filled[k] = True
+                fills[0, k] = to_sell
+                fills[1, k] = gross
+                fills[2, k] = commission
+                fills[3, k] = slippage
+                fills[4, k] = total_cost
+                fills[5, k] = proceeds
+    return filled, fills, cash
+
+
+@njit(cache=True)
+def _value_path_stats_nb(values: np.ndarray, returns: np.ndarray) -> Tuple[float, float, float]:
+    """
+    One fused pass over a value path and its simple returns (``returns[t - 1]`` is
+    the return into ``values[t]``): (mean, sample std) of the returns via Welford's
+    update, skipping NaN returns, and the maximum drawdown from the running peak.
+    """
+    n = 0
+    mean = 0.0
+    m2 = 0.0
+    peak = values[0]
+    max_dd = 0.0
+    for t in range(values.shape[0]):
+        v = values[t]
+        if v > peak:
+            peak = v
+        if peak > 0:
+            dd = (peak - v) / peak
+            if dd > max_dd:
+                max_dd = dd
+        if t > 0:
+            r = returns[t - 1]
+            if r == r:  # not NaN
+                n += 1
+                delta = r - mean
+                mean += delta / n
+                m2 += delta * (r - mean)
+    std = np.sqrt(m2 / (n - 1)) if n > 1 else np.nan
+    if n == 0:
+        mean = np.nan
+    return mean, std, max_dd
+
+
+def warm_up_kernels() -> None:
+    """
+    Compile the backtest kernels ahead of the first backtest.
+
+    Each kernel is called once on tiny inputs with the dtypes and layouts the
+    simulation uses, so numba compiles them (or loads them from its on-disk
+    cache) now rather than inside the first run. Without numba the calls are
+    trivial plain-Python work. Safe to run on a background thread at startup.
+    """
+    prices = np.ones((2, 1), dtype=np.float64)
+    prices.setflags(write=False)  # market matrices are read-only
+    holdings = np.ones(1, dtype=np.float64)
+    values = np.empty(2, dtype=np.float64)
+    _mark_to_market_nb(prices, holdings, 0.0, 0, 2, values)
+    _apply_trades_nb(
+        np.zeros(1, dtype=np.int8),
+        np.zeros(1, dtype=np.int64),
+        np.ones(1, dtype=np.float64),
+        np.ones(1, dtype=np.float64),
+        np.ones(1, dtype=np.float64),
+        np.zeros(1, dtype=np.float64),
+        2.0,
+        0.0,
+        0.0,
+    )
+    _value_path_stats_nb(values, values[1:])
+
+
+@dataclass(frozen=True)
+class _MarketData:
+    """Strategy-independent alignment of normalized price history for one backtest period."""
+
+    symbols: List[str]
+    dates: pd.DatetimeIndex
+    quoted_matrix: np.ndarray  # (dates x symbols) bool, True where close is a finite quote
+    priced_matrix: np.ndarray  # (dates x symbols) float64 closes, 0.0 where not quoted
+    column_index: Dict[str, int]
+    history_ends: Dict[str, np.ndarray]
+    # ``dates`` boxed once; each result gets a shallow copy of this list
+    timestamps: List[pd.Timestamp] = field(default_factory=list, compare=False, repr=False)
+    # Read-only next-due rebalance rows per period code, filled on first use so runs
+    # in a batch that share a frequency share the schedule
+    rebalance_schedules: Dict[str, np.ndarray] = field(
+        default_factory=dict, compare=False, repr=False
+    )
+
+
+class _HistoryView(Mapping):
+    """
+    Read-only ``{symbol: history up to one simulation row}`` handed to strategies.
+
+    Each frame is sliced positionally the first time its symbol is accessed, so a
+    strategy that reads only some symbols does not pay for slicing the others.
+    The slices are views of the service's cached history: without pandas
+    copy-on-write, writing into one would change it for every later backtest, so
+    strategies must copy a frame before modifying it.
+    """
+
+    __slots__ = ("_price_history", "_history_ends", "_row", "_slices")
+
+    def __init__(
+        self,
+        price_history: Dict[str, pd.DataFrame],
+        history_ends: Dict[str, np.ndarray],
+        row: int,
+    ):
+        self._price_history = price_history
+        self._history_ends = history_ends
+        self._row = row
+        self._slices: Dict[str, pd.DataFrame] = {}
+
+    def __getitem__(self, symbol: str) -> pd.DataFrame:
+        history = self._slices.get(symbol)
+        if history is None:
+            df = self._price_history[symbol]
+            history = df.iloc[: self._history_ends[symbol][self._row]]
+            self._slices[symbol] = history
+        return history
+
+    def __iter__(self):
+        return iter(self._price_history)
+
+    def __len__(self) -> int:
+        return len(self._price_history)
+
+    def __contains__(self, symbol: object) -> bool:
+        return symbol in self._price_history
+
+
+@dataclass
+class _TradeBuffer:
+    """
+    Columnar store for executed trades during a simulation.
+
+    Numeric fields and the execution timestamp live in preallocated arrays that
+    double on overflow, so recording a rebalance's trades is one slice write per
+    column rather than a dict per trade.
+    ``to_columns`` is what BacktestResult stores; its per-trade records are built
+    from those columns on demand.
+    """
+
+    capacity: int = 256
+    size: int = 0
+    symbols: List[str] = field(default_factory=list)
+    reasons: List[Optional[str]] = field(default_factory=list)
+    actions: np.ndarray = field(init=False)
+    timestamps: np.ndarray = field(init=False)
+    has_score: np.ndarray = field(init=False)
+    values: Dict[str, np.ndarray] = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.actions = np.empty(self.capacity, dtype=np.uint8)
+        self.timestamps = np.full(self.capacity, np.datetime64("NaT"), dtype="datetime64[ns]")
+        self.has_score = np.empty(self.capacity, dtype=np.bool_)
+        self.values = {name: np.empty(self.capacity, dtype=np.float64) for name in _TRADE_FLOAT_FIELDS}
+
+    def __len__(self) -> int:
+        return self.size
+
+    def _grow(self) -> None:
+        self.capacity *= 2
+        self.actions = np.resize(self.actions, self.capacity)
+        self.timestamps = np.resize(self.timestamps, self.capacity)
+        self.has_score = np.resize(self.has_score, self.capacity)
+        self.values = {name: np.resize(arr, self.capacity) for name, arr in self.values.items()}
+
+    def extend(
+        self,
+        symbols: List[str],
+        action_codes: np.ndarray,
+        timestamp: Any,
+        reasons: List[Optional[str]],
+        scores: Optional[np.ndarray],
+        **numeric: np.ndarray,
+    ) -> None:
+        """Append a batch of trades sharing one timestamp as slice writes per column."""
+        n = len(symbols)
+        if n == 0:
+            return
+        while self.size + n > self.capacity:
+            self._grow()
+        rows = slice(self.size, self.size + n)
+        self.symbols.extend(symbols)
+        self.reasons.extend(reasons)
+        self.timestamps[rows] = timestamp
+        self.actions[rows] = action_codes
+        self.has_score[rows] = scores is not None
+        self.values["score"][rows] = np.nan if scores is None else scores
+        for name, column in numeric.items():
+            self.values[name][rows] = column
+        self.size += n
+
+    def to_columns(self) -> Dict[str, Any]:
+        """
+        Executed trades as trimmed column arrays keyed like the records, in execution order.
+
+        Passing the result to ``pd.DataFrame`` gives one row per record without
+        building the dicts first. ``score`` is masked where the strategy reported
+        no scores (None in the records) and NaN where it did not score the symbol.
+        """
+        n = self.size
+        columns: Dict[str, Any] = {
+            "symbol": list(self.symbols),
+            "action": np.array(_TRADE_ACTIONS, dtype=object)[self.actions[:n]],
+        }
+        for name in _TRADE_FLOAT_FIELDS[:-1]:
+            columns[name] = self.values[name][:n].copy()
+        columns["timestamp"] = self.timestamps[:n].copy()
+        columns["reason"] = list(self.reasons)
+        columns["score"] = np.ma.MaskedArray(
+            self.values["score"][:n].copy(), mask=~self.has_score[:n]
+        )
+        return columns
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """Executed trades as dicts, in execution order."""
+        lists = _trade_column_lists(self.to_columns())
+        return [dict(zip(lists, row)) for row in zip(*lists.values())]
+
 
 class BacktestingService:
     """Service for running comprehensive backtests on trading strategies."""
 
-    def __init__(self, data_service: DataService):
+    def __init__(self, data_service: DataService, market_cache_size: int = 8):
+        """
+        Args:
+            data_service: Source of price history
+            market_cache_size: How many fetched-and-prepared markets (per holdings
+                symbols, benchmark and period) to keep for repeated backtests; 0
+                disables caching. Markets for periods ending today or later are
+                refetched after a few minutes, since their last bar may still change
+        """
         self.data_service = data_service
         self.logger = logging.getLogger(__name__)
+        self._market_cache_size = market_cache_size
+        # (holdings symbols, benchmark, start, end) -> (price history, market, fetched at
+        # (monotonic)), LRU order
+        self._market_cache: "OrderedDict[Tuple[Any, ...], Tuple[Dict[str, pd.DataFrame], _MarketData, float]]" = (
+            OrderedDict()
+        )
+        self._market_cache_lock = threading.Lock()
+
+    def clear_cache(self) -> None:
+        """Forget cached price history so the next backtest refetches it."""
+        with self._market_cache_lock:
+            self._market_cache.clear()
 
     @staticmethod
     def _to_float(val: object) -> float:
-        """Best-effort conversion to float, returns nan on failure."""
+        """
+        Best-effort conversion to float, returns nan on failure.
+
+        Only for serializing values of unknown provenance (strategy weights and
+        scores); simulation prices are float64 from ingest.
+        """
+        if isinstance(val, float):
+            return val
+        # float() takes ints, NumPy scalars, 0-d arrays, Decimals and numeric
+        # strings; None, timestamps and larger arrays raise and fall to nan
         try:
-            if isinstance(val, (int, float, np.floating)):
-                return float(val)
-            # pandas scalar
-            return float(np.asarray(val).astype(np.float64))
+            return float(val)
         except Exception:
             return float("nan")
 
@@ -66,6 +412,120 @@ class BacktestingService:
             f"Starting backtest for strategy '{strategy_config.name}' from {backtest_config.start_date} to {backtest_config.end_date}"
         )
 
+        price_history, market = self._load_market(initial_holdings, backtest_config)
+        return self._backtest_on_market(
+            strategy, strategy_config, backtest_config, initial_holdings, price_history, market
+        )
+
+    def run_backtests_batch(
+        self,
+        runs: List[Tuple[StrategyProtocol, StrategyConfig]],
+        backtest_config: BacktestConfig,
+        initial_holdings: Dict[str, float],
+        max_workers: Optional[int] = None,
+        use_processes: bool = True,
+        use_threads: bool = False,
+    ) -> List[BacktestResult]:
+        """
+        Backtest several strategies/parameterizations over the same market data.
+
+        Price history is fetched, normalized and aligned into the price matrix once
+        and shared by every run; the simulations then fan out on a process pool,
+        which sidesteps the GIL for pure-Python strategies. Pass ``max_workers=1``
+        to run them one after another in this process instead. Each run stays
+        sequential; only independent runs execute in parallel.
+
+        Args:
+            runs: (strategy, strategy_config) pairs, e.g. one per parameter combination
+            backtest_config: Backtesting parameters shared by all runs
+            initial_holdings: Starting portfolio holdings (symbol -> shares)
+            max_workers: Pool worker count (defaults to the CPU count, at most one
+                per run); 1 runs sequentially
+            use_processes: Run on a process pool (the default). Each worker receives
+                the prepared market once; strategies, configs and results must be
+                picklable. False runs sequentially unless ``use_threads`` is set.
+            use_threads: Run on a thread pool instead. Only worthwhile for strategies
+                that release the GIL (NumPy-heavy or I/O); strategy instances shared
+                between runs must not keep per-call state.
+
+        Returns:
+            One BacktestResult per run, in ``runs`` order
+        """
+        if not runs:
+            return []
+
+        self.logger.info(
+            f"Starting batch of {len(runs)} backtests from {backtest_config.start_date} to {backtest_config.end_date}"
+        )
+        price_history, market = self._load_market(initial_holdings, backtest_config)
+
+        def _run(run: Tuple[StrategyProtocol, StrategyConfig]) -> BacktestResult:
+            strategy, strategy_config = run
+            return self._backtest_on_market(
+                strategy, strategy_config, backtest_config, initial_holdings, price_history, market
+            )
+
+        workers = min(max_workers or os.cpu_count() or 1, len(runs))
+        if workers == 1 or not (use_processes or use_threads):
+            return [_run(run) for run in runs]
+        if use_threads:
+            # Pure-Python strategy callbacks hold the GIL, so threads are opt-in
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                return list(pool.map(_run, runs))
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_batch_worker,
+            initargs=(backtest_config, initial_holdings, price_history, market),
+        ) as pool:
+            return list(pool.map(_run_batch_job, runs))
+
+    def _load_market(
+        self, initial_holdings: Dict[str, float], backtest_config: BacktestConfig
+    ) -> Tuple[Dict[str, pd.DataFrame], _MarketData]:
+        """
+        Normalized price history and prepared market for a backtest.
+
+        Memoized per (holdings symbols, benchmark, period) so parameter sweeps and
+        repeated runs skip the provider round trip and the alignment work. A period
+        ending today or later may hold an unfinished bar, so its entry expires after
+        ``_MARKET_CACHE_TTL_SECONDS``; closed periods are kept until evicted. Fetches
+        missing any holding or the benchmark are not cached.
+        """
+        end = backtest_config.end_date.date()
+        key = (
+            tuple(initial_holdings),
+            backtest_config.benchmark,
+            backtest_config.start_date.date(),
+            end,
+        )
+        with self._market_cache_lock:
+            cached = self._market_cache.get(key)
+            if cached is not None:
+                price_history, market, fetched_at = cached
+                if end < date.today() or time.monotonic() - fetched_at < _MARKET_CACHE_TTL_SECONDS:
+                    self._market_cache.move_to_end(key)
+                    return price_history, market
+                del self._market_cache[key]
+
+        price_history = self._fetch_price_history(initial_holdings, backtest_config)
+        loaded = (price_history, self._prepare_market(price_history, backtest_config))
+        # A symbol missing after a transient provider error must not stick for
+        # later runs, so only complete fetches are kept
+        complete = all(
+            symbol in price_history and not price_history[symbol].empty
+            for symbol in (*initial_holdings, backtest_config.benchmark)
+        )
+        if complete and self._market_cache_size > 0:
+            with self._market_cache_lock:
+                self._market_cache[key] = (*loaded, time.monotonic())
+                while len(self._market_cache) > self._market_cache_size:
+                    self._market_cache.popitem(last=False)
+        return loaded
+
+    def _fetch_price_history(
+        self, initial_holdings: Dict[str, float], backtest_config: BacktestConfig
+    ) -> Dict[str, pd.DataFrame]:
+        """Fetch history for the holdings plus benchmark, normalized for simulation."""
         # Get historical data for all symbols
         all_symbols = list(initial_holdings.keys())
         if backtest_config.benchmark not in all_symbols:
@@ -81,19 +541,22 @@ class BacktestingService:
         if not price_history:
             raise ValueError("No price history available for backtesting")
 
-        # Normalize timezone awareness across all price history indices to avoid tz-aware/naive comparison errors
-        for symbol, df in list(price_history.items()):
-            try:
-                tz_loc = getattr(df, "tz_localize", None)
-                df2 = tz_loc(None) if callable(tz_loc) else df
-                price_history[symbol] = df2  # type: ignore[assignment]
-            except Exception:
-                # If not tz-aware or operation unsupported, keep original; downstream code has guards
-                price_history[symbol] = df
+        # Normalize every frame once (tz-naive, sorted) so nothing downstream has to
+        return self._normalize_price_history(price_history)
 
+    def _backtest_on_market(
+        self,
+        strategy: StrategyProtocol,
+        strategy_config: StrategyConfig,
+        backtest_config: BacktestConfig,
+        initial_holdings: Dict[str, float],
+        price_history: Dict[str, pd.DataFrame],
+        market: _MarketData,
+    ) -> BacktestResult:
+        """Simulate one strategy on prepared market data and compute its metrics."""
         # Run the backtest simulation
         simulation_result = self._run_simulation(
-            strategy, strategy_config, backtest_config, initial_holdings, price_history
+            strategy, strategy_config, backtest_config, initial_holdings, price_history, market
         )
 
         # Calculate performance metrics
@@ -101,6 +564,10 @@ class BacktestingService:
             simulation_result, backtest_config, price_history
         )
 
+        simulation_result["portfolio_values"] = simulation_result["portfolio_values"].tolist()
+        simulation_result["daily_returns"] = simulation_result["daily_returns"].tolist()
+        simulation_result["timestamps"] = list(market.timestamps)
+
         return BacktestResult(
             strategy_name=strategy_config.name,
             config=backtest_config,
@@ -110,6 +577,52 @@ class BacktestingService:
             **simulation_result,
         )
 
+    def _prepare_market(
+        self, price_history: Dict[str, pd.DataFrame], backtest_config: BacktestConfig
+    ) -> _MarketData:
+        """Align normalized price history for the backtest period; independent of strategy."""
+        # Get aligned dates from price history: one sorted union, filtered to the
+        # backtest period by calendar date (tz-naive)
+        shared_index = self._shared_index(price_history)
+        simulation_dates = self._simulation_dates(
+            price_history,
+            backtest_config.start_date.date(),
+            backtest_config.end_date.date(),
+            shared_index,
+        )
+
+        if len(simulation_dates) < 2:
+            raise ValueError("Insufficient data for backtesting period")
+
+        # Pre-align closes into one contiguous (dates x symbols) float64 matrix; NaN
+        # marks a missing quote. Only the quote mask and the zero-filled prices are
+        # kept: the NaN-marked closes equal priced_matrix wherever quoted_matrix holds
+        symbols = list(price_history.keys())
+        priced_matrix = np.ascontiguousarray(
+            self._build_close_matrix(price_history, simulation_dates, shared_index)
+        )
+        quoted_matrix = np.isfinite(priced_matrix)
+        # Missing quotes contribute nothing to valuation
+        priced_matrix[~quoted_matrix] = 0.0
+        # Row counts of each symbol's history visible on every simulation date, so
+        # strategies get positional slices instead of a boolean mask per rebalance
+        history_ends = self._history_ends(price_history, simulation_dates, shared_index)
+
+        # Every run on this market (including concurrent batch runs) reads these
+        # arrays without copying, so nothing may write to them
+        for arr in (quoted_matrix, priced_matrix, *history_ends.values()):
+            arr.setflags(write=False)
+
+        return _MarketData(
+            symbols=symbols,
+            dates=simulation_dates,
+            quoted_matrix=quoted_matrix,
+            priced_matrix=priced_matrix,
+            column_index={symbol: j for j, symbol in enumerate(symbols)},
+            history_ends=history_ends,
+            timestamps=simulation_dates.tolist(),
+        )
+
     def _run_simulation(
         self,
         strategy: StrategyProtocol,
@@ -117,249 +630,399 @@ class BacktestingService:
         backtest_config: BacktestConfig,
         initial_holdings: Dict[str, float],
         price_history: Dict[str, pd.DataFrame],
+        market: Optional[_MarketData] = None,
     ) -> Dict:
         """Run the backtesting simulation."""
 
         # Initialize simulation state
         current_holdings = initial_holdings.copy()
         cash = 0.0  # will be computed after dates are aligned
-        portfolio_values: List[float] = []
-        daily_returns: List[float] = []
-        timestamps: List = []
-        holdings_history: List[Dict[str, float]] = []
-        rebalance_details: List[Dict] = []
+        # Per-rebalance diagnostics are opt-in; otherwise each strategy result is
+        # dropped once its trades are applied
+        capture_diagnostics = backtest_config.capture_diagnostics
+        rebalance_raw: List[Tuple[pd.Timestamp, Dict[str, float], Any]] = []
         total_trades = 0
         winning_trades = 0
         losing_trades = 0
         # Record of all executed trades with metadata for plotting/analysis
-        executed_trades: List[Dict] = []
-
-        # Get aligned dates from price history
-        all_dates = set()
-        for df in price_history.values():
-            # Ensure tz-naive for consistent comparisons
-            idx = df.index
-            tz_loc = getattr(idx, "tz_localize", None)
-            try:
-                idx2 = tz_loc(None) if callable(tz_loc) else idx
-            except Exception:
-                idx2 = idx
-            try:
-                idx_p = pd.Index(idx2)  # type: ignore[call-arg]
-                for d in idx_p.tolist():
-                    all_dates.add(d)
-            except Exception:
-                # best effort fallback
-                try:
-                    for d in list(idx2):  # type: ignore[arg-type]
-                        all_dates.add(d)
-                except Exception:
-                    pass
-
-        simulation_dates = sorted(list(all_dates))
-
-        # Filter dates to backtest period (use tz-naive comparison by converting to dates)
-        start_date_naive = backtest_config.start_date.date()
-        end_date_naive = backtest_config.end_date.date()
-        simulation_dates = [
-            date
-            for date in simulation_dates
-            if start_date_naive
-            <= getattr(date, "date", lambda: date)()
-            <= end_date_naive
-        ]
+        executed_trades = _TradeBuffer()
 
-        if len(simulation_dates) < 2:
-            raise ValueError("Insufficient data for backtesting period")
+        if market is None:
+            market = self._prepare_market(price_history, backtest_config)
+        simulation_dates = market.dates
+        symbols = market.symbols
+        quoted_matrix = market.quoted_matrix
+        priced_matrix = market.priced_matrix
+        column_index = market.column_index
+        history_ends = market.history_ends
 
         # Compute initial cash by valuing initial_holdings at the first simulation date
         # so that total initial portfolio value matches initial_capital best-effort
-        first_date = simulation_dates[0]
-        initial_value = 0.0
-        for symbol, shares in current_holdings.items():
-            df = price_history.get(symbol)
-            if df is not None and not df.empty and first_date in df.index:
+        holdings_vec = self._holdings_vector(current_holdings, column_index)
+        initial_value = float(np.dot(holdings_vec, priced_matrix[0]))
+        cash = max(float(backtest_config.initial_capital) - initial_value, 0.0)
+
+        # Rebalancing: due on the first simulation day of each new calendar period
+        # (week/month/quarter). For every day, next_due is the first day of the
+        # following period; a failed rebalance is retried the next day
+        next_due = self._rebalance_schedule(market, strategy_config.rebalance_frequency)
+        n_days = len(simulation_dates)
+        last_rebalance = -1
+
+        # Holdings only change on rebalance days, so value each stretch between them in
+        # one block and drop into Python just for the strategy call and trades
+        values = np.empty(n_days, dtype=np.float64)
+        # (first day, stop day, holdings) per stretch between rebalances; expanded
+        # into the holdings matrix once after the loop
+        holdings_segments: List[Tuple[int, int, Dict[str, float]]] = []
+        position_values = np.empty(len(symbols), dtype=np.float64)
+        start = 0
+        while start < n_days:
+            # Next day a rebalance is due (first day, or first day of the next period)
+            i = start if last_rebalance < 0 else max(start, int(next_due[last_rebalance]))
+            stop = min(i, n_days - 1) + 1
+
+            # Store portfolio values; daily returns are derived after the loop
+            self._mark_to_market(priced_matrix, holdings_vec, cash, start, stop, values)
+            # Holdings only change on rebalances, and each rebalance replaces the dict
+            # (_execute_trades returns a new one) rather than mutating it, so the
+            # stretch until the next change is recorded once
+            holdings_segments.append((start, stop, current_holdings))
+            start = stop
+
+            if i >= n_days - 1:  # Don't rebalance on last day
+                break
+
+            current_date = simulation_dates[i]
+            price_row = priced_matrix[i]
+            # Compute invested value separately to avoid cash diluting asset weights;
+            # position values go into one buffer reused across rebalances
+            invested_total = float(np.dot(holdings_vec, price_row))
+            np.multiply(holdings_vec, price_row, out=position_values)
+            portfolio_value = float(values[i])
+            current_prices = self._prices_for_row(symbols, priced_matrix[i], quoted_matrix[i])
+            current_weights = self._weights_for_row(
+                current_holdings,
+                column_index,
+                position_values,
+                invested_total,
+            )
+            try:
+                # Execute strategy
+                strategy_result = strategy.execute(
+                    current_weights,
+                    _HistoryView(price_history, history_ends, i),
+                    current_prices,
+                    strategy_config,
+                )
+
+                # Execute trades
+                trade_stats = self._execute_trades(
+                    strategy_result.trades,
+                    current_holdings,
+                    cash,
+                    current_prices,
+                    backtest_config,
+                    portfolio_value,
+                    current_date,
+                    getattr(strategy_result, "scores", None),
+                    executed_trades,
+                    column_index,
+                    holdings_vec,
+                )
+
+                current_holdings = trade_stats["new_holdings"]
+                # The kernel applied the fills to a copy of the vector by column
+                holdings_vec = trade_stats["holdings_vec"]
+                cash = trade_stats["new_cash"]
+                total_trades += trade_stats["num_trades"]
+                winning_trades += trade_stats["winning_trades"]
+                losing_trades += trade_stats["losing_trades"]
+
+                # Keep raw references; diagnostics are serialized once after the loop
+                if capture_diagnostics:
+                    rebalance_raw.append((current_date, current_weights, strategy_result))
+
+                last_rebalance = i
+
+            except Exception as e:
+                self.logger.warning(
+                    f"Strategy execution failed on {current_date}: {e}"
+                )
+
+        # One allocation: differences divided in place by the previous day's value
+        daily_returns = np.diff(values)
+        daily_returns /= values[:-1]
+
+        # Series stay as arrays for the metrics pass; run_backtest converts them to lists
+        return {
+            "portfolio_values": values,
+            "daily_returns": daily_returns,
+            "timestamps": simulation_dates,
+            "total_trades": total_trades,
+            "winning_trades": winning_trades,
+            "losing_trades": losing_trades,
+            # Expose executed trades for downstream analytics/plotting
+            "executed_trades_columns": executed_trades.to_columns(),
+            **self._holdings_matrix(holdings_segments, n_days),
+            "rebalance_details": self._finalize_rebalance_details(rebalance_raw),
+        }
+
+    @staticmethod
+    def _holdings_matrix(
+        segments: List[Tuple[int, int, Dict[str, float]]], n_days: int
+    ) -> Dict[str, Any]:
+        """
+        Shares held per day as a (days x symbols) matrix, NaN where not yet held.
+
+        Each rebalance copies the previous holdings and adds newly filled symbols at
+        the end, so every stretch's keys are a prefix of the last stretch's: that
+        order is the column order, and a stretch fills its leading columns.
+        """
+        symbols = list(segments[-1][2]) if segments else []
+        matrix = np.full((n_days, len(symbols)), np.nan)
+        for start, stop, holdings in segments:
+            matrix[start:stop, : len(holdings)] = list(holdings.values())
+        return {"holdings_matrix": matrix, "holdings_symbols": symbols}
+
+    def _finalize_rebalance_details(
+        self, rebalance_raw: List[Tuple[pd.Timestamp, Dict[str, float], Any]]
+    ) -> List[Dict]:
+        """Serialize (date, weights, strategy result) per rebalance into JSON-friendly dicts."""
+
+        def _iso(ts_obj):
+            try:
+                return pd.to_datetime(ts_obj).to_pydatetime().isoformat()
+            except Exception:
                 try:
-                    px = self._to_float(df.loc[first_date, "close"])  # type: ignore[index]
-                    if np.isfinite(px):
-                        initial_value += float(shares) * float(px)
+                    return str(ts_obj)
                 except Exception:
-                    pass
-        cash = max(float(backtest_config.initial_capital) - float(initial_value), 0.0)
+                    return None
 
-        prev_portfolio_value = float(backtest_config.initial_capital)
+        def _float_map(m):
+            out = {}
+            for k, v in (m or {}).items():
+                out[str(k)] = self._to_float(v)
+            return out
 
-        # Rebalancing frequency settings
-        rebalance_days = self._get_rebalance_frequency_days(
-            strategy_config.rebalance_frequency
-        )
-        last_rebalance_date = None
-
-        for i, current_date in enumerate(simulation_dates):
-            # Get current prices for this date
-            current_prices: Dict[str, float] = {}
-            for symbol, df in price_history.items():
-                if current_date in df.index:
-                    val = df.loc[current_date, "close"]
-                    price_val = self._to_float(val)
-                    if np.isfinite(price_val):
-                        current_prices[symbol] = price_val
-
-            # Calculate current portfolio value
-            # Compute invested value separately to avoid cash diluting asset weights
-            invested_total = 0.0
-            position_values: Dict[str, float] = {}
-            for symbol, shares in current_holdings.items():
-                if symbol in current_prices:
-                    pv = float(shares) * float(current_prices[symbol])
-                    position_values[symbol] = pv
-                    invested_total += pv
-            portfolio_value = cash + invested_total
-
-            current_weights: Dict[str, float] = {}
-            for symbol in current_holdings.keys():
-                if invested_total > 0 and symbol in position_values:
-                    current_weights[symbol] = position_values[symbol] / invested_total
+        def _serialize_trade(t, current_date):
+            try:
+                sym = getattr(t, "symbol", None)
+                act = getattr(t, "action", None)
+                qty = getattr(t, "quantity", None)
+                price = getattr(t, "price", None)
+                ts = getattr(t, "timestamp", None) or current_date
+                reason = getattr(t, "reason", None)
+                if act is None:
+                    act_str = None
                 else:
-                    current_weights[symbol] = 0.0
+                    act_val = getattr(act, "value", None)
+                    if isinstance(act_val, str):
+                        act_str = act_val
+                    elif hasattr(act, "value"):
+                        act_str = str(getattr(act, "value"))
+                    else:
+                        act_str = str(act)
+                return {
+                    "symbol": None if sym is None else str(sym),
+                    "action": act_str,
+                    "quantity": None if qty is None else float(qty),
+                    "price": None if price is None else float(price),
+                    "timestamp": _iso(ts),
+                    "reason": None if reason is None else str(reason),
+                }
+            except Exception:
+                return {"trade": str(t)}
+
+        rebalance_details: List[Dict] = []
+        for current_date, current_weights, strategy_result in rebalance_raw:
+            try:
+                rebalance_details.append(
+                    {
+                        "timestamp": _iso(current_date),
+                        "weights": _float_map(current_weights),
+                        "target_weights": _float_map(getattr(strategy_result, "new_weights", {})),
+                        "scores": _float_map(getattr(strategy_result, "scores", {})),
+                        "trades": [
+                            _serialize_trade(t, current_date)
+                            for t in getattr(strategy_result, "trades", [])
+                        ],
+                    }
+                )
+            except Exception:
+                pass
+        return rebalance_details
 
-            # Store portfolio value and calculate daily return
-            portfolio_values.append(portfolio_value)
-            timestamps.append(current_date)
-            holdings_history.append(dict(current_holdings))
+    @staticmethod
+    def _normalize_price_history(
+        price_history: Dict[str, pd.DataFrame],
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Return price history with tz-naive, nanosecond, ascending indices and float64 closes.
 
-            if i > 0:
-                daily_return = (
-                    portfolio_value - prev_portfolio_value
-                ) / prev_portfolio_value
-                daily_returns.append(daily_return)
+        Done once at ingest; the simulation, history slicing and benchmark metrics
+        rely on it rather than re-checking each frame or converting prices per read.
+        Frames that already conform are passed through as-is.
+        """
+        normalized: Dict[str, pd.DataFrame] = {}
+        for symbol, df in price_history.items():
+            index = df.index
+            if not isinstance(index, pd.DatetimeIndex) or index.tz is not None or index.unit != "ns":
+                # Replace the index only; the column data is not touched
+                index = pd.DatetimeIndex(index)
+                if index.tz is not None:
+                    index = index.tz_localize(None)
+                df = df.set_axis(index.as_unit("ns"))
+            if not df.index.is_monotonic_increasing:
+                df = df.sort_index()
+            if "close" in df.columns and df["close"].dtype != np.float64:
+                df = df.astype({"close": np.float64})
+            normalized[symbol] = df
+        return normalized
 
-            prev_portfolio_value = portfolio_value
+    @staticmethod
+    def _shared_index(price_history: Dict[str, pd.DataFrame]) -> Optional[pd.Index]:
+        """
+        The common index when every symbol trades on exactly the same dates, else None.
 
-            # Check if it's time to rebalance
-            should_rebalance = (
-                last_rebalance_date is None
-                or (current_date - last_rebalance_date).days >= rebalance_days
+        That is the usual case for a single exchange calendar and lets alignment skip
+        the union and reindex entirely.
+        """
+        indexes = [df.index for df in price_history.values()]
+        reference = indexes[0]
+        if reference.is_unique and all(idx.equals(reference) for idx in indexes[1:]):
+            return reference
+        return None
+
+    @staticmethod
+    def _simulation_dates(
+        price_history: Dict[str, pd.DataFrame],
+        start_date,
+        end_date,
+        shared_index: Optional[pd.Index] = None,
+    ) -> pd.DatetimeIndex:
+        """Sorted union of every symbol's (normalized) dates whose calendar day is within [start_date, end_date]."""
+        # Sorted dates: the period [start_date, end_date + 1 day) is one slice
+        start = pd.Timestamp(start_date)
+        stop = pd.Timestamp(end_date) + pd.Timedelta(days=1)
+        if shared_index is not None:
+            dates = pd.DatetimeIndex(shared_index)
+            return dates[dates.searchsorted(start) : dates.searchsorted(stop)]
+        # Each normalized index is sorted, so cut it to the period before the union
+        # instead of sorting every symbol's full history
+        return pd.DatetimeIndex(
+            np.unique(
+                np.concatenate(
+                    [
+                        df.index.values[df.index.searchsorted(start) : df.index.searchsorted(stop)]
+                        for df in price_history.values()
+                    ]
+                )
             )
+        )
 
-            if should_rebalance and i < len(simulation_dates) - 1:  # Don't rebalance on last day
-                try:
-                    # Execute strategy
-                    strategy_result = strategy.execute(
-                        current_weights,
-                        {
-                            symbol: df[df.index <= current_date]
-                            for symbol, df in price_history.items()
-                        },
-                        current_prices,
-                        strategy_config,
-                    )
-
-                    # Execute trades
-                    trade_stats = self._execute_trades(
-                        strategy_result.trades,
-                        current_holdings,
-                        cash,
-                        current_prices,
-                        backtest_config,
-                        portfolio_value,
-                        current_date,
-                        getattr(strategy_result, "scores", None),
-                    )
-
-                    current_holdings = trade_stats["new_holdings"]
-                    cash = trade_stats["new_cash"]
-                    total_trades += trade_stats["num_trades"]
-                    winning_trades += trade_stats["winning_trades"]
-                    losing_trades += trade_stats["losing_trades"]
-
-                    # Accumulate executed trade metadata
-                    for t in trade_stats.get("executed", []):
-                        executed_trades.append(t)
-
-                    # Record rebalance diagnostics with JSON-friendly values
-                    try:
-                        def _iso(ts_obj):
-                            try:
-                                return pd.to_datetime(ts_obj).to_pydatetime().isoformat()
-                            except Exception:
-                                try:
-                                    return str(ts_obj)
-                                except Exception:
-                                    return None
-
-                        def _float_map(m):
-                            out = {}
-                            for k, v in (m or {}).items():
-                                try:
-                                    out[str(k)] = float(v)
-                                except Exception:
-                                    try:
-                                        out[str(k)] = self._to_float(v)
-                                    except Exception:
-                                        pass
-                            return out
-
-                        def _serialize_trade(t):
-                            try:
-                                sym = getattr(t, "symbol", None)
-                                act = getattr(t, "action", None)
-                                qty = getattr(t, "quantity", None)
-                                price = getattr(t, "price", None)
-                                ts = getattr(t, "timestamp", None) or current_date
-                                reason = getattr(t, "reason", None)
-                                if act is None:
-                                    act_str = None
-                                else:
-                                    act_val = getattr(act, "value", None)
-                                    if isinstance(act_val, str):
-                                        act_str = act_val
-                                    elif hasattr(act, "value"):
-                                        act_str = str(getattr(act, "value"))
-                                    else:
-                                        act_str = str(act)
-                                return {
-                                    "symbol": None if sym is None else str(sym),
-                                    "action": act_str,
-                                    "quantity": None if qty is None else float(qty),
-                                    "price": None if price is None else float(price),
-                                    "timestamp": _iso(ts),
-                                    "reason": None if reason is None else str(reason),
-                                }
-                            except Exception:
-                                return {"trade": str(t)}
-
-                        rebalance_details.append(
-                            {
-                                "timestamp": _iso(current_date),
-                                "weights": _float_map(current_weights),
-                                "target_weights": _float_map(getattr(strategy_result, "new_weights", {})),
-                                "scores": _float_map(getattr(strategy_result, "scores", {})),
-                                "trades": [_serialize_trade(t) for t in getattr(strategy_result, "trades", [])],
-                            }
-                        )
-                    except Exception:
-                        pass
-
-                    last_rebalance_date = current_date
-
-                except Exception as e:
-                    self.logger.warning(
-                        f"Strategy execution failed on {current_date}: {e}"
-                    )
-                    continue
+    @staticmethod
+    def _build_close_matrix(
+        price_history: Dict[str, pd.DataFrame],
+        dates: pd.DatetimeIndex,
+        shared_index: Optional[pd.Index] = None,
+    ) -> np.ndarray:
+        """
+        Align every symbol's close onto ``dates`` as a float64 (dates x symbols) matrix.
 
+        Columns follow ``price_history`` order. Dates a symbol did not trade are NaN
+        (not forward-filled), matching the per-date lookups this replaces. With a
+        shared index, ``dates`` is a contiguous run of it and the closes are stacked
+        directly; otherwise rows are located with one searchsorted per symbol.
+        """
+        if shared_index is not None:
+            lo = shared_index.searchsorted(dates[0])
+            hi = lo + len(dates)
+            return np.column_stack(
+                [df["close"].to_numpy(dtype=np.float64)[lo:hi] for df in price_history.values()]
+            )
+        # Scatter each symbol's closes into its column at the rows of matching dates
+        dates_ns = dates.as_unit("ns").asi8
+        n_dates = len(dates_ns)
+        closes = np.full((n_dates, len(price_history)), np.nan, dtype=np.float64)
+        for j, df in enumerate(price_history.values()):
+            index_ns = df.index.asi8
+            rows = np.searchsorted(dates_ns, index_ns)
+            found = rows < n_dates
+            found[found] = dates_ns[rows[found]] == index_ns[found]
+            closes[rows[found], j] = df["close"].to_numpy(dtype=np.float64)[found]
+        return closes
+
+    @staticmethod
+    def _history_ends(
+        price_history: Dict[str, pd.DataFrame],
+        dates: pd.DatetimeIndex,
+        shared_index: Optional[pd.Index] = None,
+    ) -> Dict[str, np.ndarray]:
+        """
+        For each symbol, the number of rows dated on or before each of ``dates``.
+
+        ``df.iloc[:ends[i]]`` equals ``df[df.index <= dates[i]]`` for the sorted
+        frames produced by ``_normalize_price_history``.
+        """
+        if shared_index is not None:
+            ends = shared_index.searchsorted(dates, side="right")
+            return {symbol: ends for symbol in price_history}
         return {
-            "portfolio_values": portfolio_values,
-            "daily_returns": daily_returns,
-            "timestamps": timestamps,
-            "total_trades": total_trades,
-            "winning_trades": winning_trades,
-            "losing_trades": losing_trades,
-            # Expose executed trades for downstream analytics/plotting
-            "executed_trades": executed_trades,
-            "holdings_history": holdings_history,
-            "rebalance_details": rebalance_details,
+            symbol: df.index.searchsorted(dates, side="right")
+            for symbol, df in price_history.items()
+        }
+
+    @staticmethod
+    def _prices_for_row(
+        symbols: List[str], row: np.ndarray, quoted: np.ndarray
+    ) -> Dict[str, float]:
+        """Map one close-matrix row to {symbol: price} for the symbols quoted that day."""
+        present = np.flatnonzero(quoted)
+        return dict(zip([symbols[j] for j in present], row[present].tolist()))
+
+    @staticmethod
+    def _mark_to_market(
+        priced_matrix: np.ndarray,
+        holdings_vec: np.ndarray,
+        cash: float,
+        start: int,
+        stop: int,
+        out: np.ndarray,
+    ) -> None:
+        """Value rows [start, stop) of the price matrix at fixed holdings and cash into ``out``."""
+        if NUMBA_AVAILABLE:
+            _mark_to_market_nb(priced_matrix, holdings_vec, cash, start, stop, out)
+            return
+        out[start:stop] = cash + priced_matrix[start:stop] @ holdings_vec
+
+    @staticmethod
+    def _holdings_vector(
+        holdings: Dict[str, float], column_index: Dict[str, int]
+    ) -> np.ndarray:
+        """Share counts aligned with the close-matrix columns; unpriced symbols are dropped."""
+        vec = np.zeros(len(column_index), dtype=np.float64)
+        for symbol, shares in holdings.items():
+            j = column_index.get(symbol)
+            if j is not None:
+                vec[j] = float(shares)
+        return vec
+
+    @staticmethod
+    def _weights_for_row(
+        holdings: Dict[str, float],
+        column_index: Dict[str, int],
+        position_values: np.ndarray,
+        invested_total: float,
+    ) -> Dict[str, float]:
+        """Invested-weight of each held symbol; 0.0 when it has no quote or nothing is invested."""
+        if invested_total > 0:
+            weights_vec = (position_values / invested_total).tolist()
+        else:
+            weights_vec = [0.0] * len(position_values)
+        return {
+            symbol: weights_vec[column_index[symbol]] if symbol in column_index else 0.0
+            for symbol in holdings
         }
 
     def _execute_trades(
@@ -372,115 +1035,133 @@ class BacktestingService:
         portfolio_value: float,
         trade_date,
         symbol_scores: Optional[Dict[str, float]] = None,
+        trade_buffer: Optional[_TradeBuffer] = None,
+        column_index: Optional[Dict[str, int]] = None,
+        holdings_vec: Optional[np.ndarray] = None,
     ) -> Dict:
         """
         Execute trades and update portfolio state.
 
         IMPORTANT: Trade.quantity is interpreted as a WEIGHT FRACTION (0..1) of the
         current portfolio value to allocate/deallocate for the given symbol at this rebalance.
+
+        Executed trades are appended to ``trade_buffer``; without one they are
+        returned as records under ``"executed"``. Given the market's
+        ``column_index`` and the matching ``holdings_vec``, trades are coded by
+        market column and the updated vector is returned under ``"holdings_vec"``. Prices already come from the
+        close matrix as floats and the buffer's float64 columns convert on
+        assignment, so only ``Trade.quantity`` (strategy output) is coerced here.
         """
         new_holdings = current_holdings.copy()
-        new_cash = cash
-        num_trades = 0
-        winning_trades = 0
-        losing_trades = 0
-        executed: List[Dict] = []
-
-        for trade in trades:
-            symbol = trade.symbol
-            if symbol not in current_prices:
-                continue
-
-            price = float(current_prices[symbol])
-            if price <= 0.0:
-                continue
-
-            # Convert weight fraction -> dollar value to trade at this rebalance
-            # Clamp quantity to [0,1] just in case
-            weight_fraction = max(0.0, min(1.0, float(trade.quantity)))
-            dollar_value = weight_fraction * portfolio_value
-            if dollar_value <= 0.0:
-                continue
-
-            shares = dollar_value / price
-            trade_value = shares * price  # == dollar_value
-            commission = trade_value * config.commission
-            slippage = trade_value * config.slippage
-            total_cost = commission + slippage
+        executed = trade_buffer if trade_buffer is not None else _TradeBuffer()
+        # Fills are stamped with the simulation date they execute on; strategies
+        # stamp their recommendations with wall-clock time
+        executed_at = pd.Timestamp(trade_date)
+        if executed_at.tz is not None:  # simulation dates are already tz-naive
+            executed_at = executed_at.tz_localize(None)
+        executed_at = np.datetime64(executed_at, "ns")
+
+        # Pass 1: keep priced trades and size them all at once. Convert weight
+        # fraction -> dollar value to trade at this rebalance, clamping quantity to [0,1]
+        priced = [
+            (trade, current_prices[trade.symbol])
+            for trade in trades
+            if trade.symbol in current_prices and current_prices[trade.symbol] > 0.0
+        ]
+        weight_fractions = np.array(
+            [max(0.0, min(1.0, float(trade.quantity))) for trade, _ in priced],
+            dtype=np.float64,
+        )
+        prices = np.array([price for _, price in priced], dtype=np.float64)
+        dollar_values = weight_fractions * portfolio_value
+        shares = dollar_values / prices
+
+        # Pass 2: apply in order in a numeric kernel; buys are gated by the cash left
+        # after earlier trades and sells by the shares held at that point
+        action_codes = np.array(
+            [_ACTION_CODES.get(trade.action, -1) for trade, _ in priced], dtype=np.int8
+        )
+        by_column = column_index is not None and holdings_vec is not None
+        if by_column:
+            # Priced symbols are market columns; the kernel updates a copy of the vector
+            symbol_codes_map = column_index
+            held = holdings_vec.copy()
+        else:
+            symbol_codes_map = {}
+            for trade, _ in priced:
+                symbol_codes_map.setdefault(trade.symbol, len(symbol_codes_map))
+            held = np.array([new_holdings.get(sym, 0.0) for sym in symbol_codes_map], dtype=np.float64)
+        symbol_codes = np.array(
+            [symbol_codes_map[trade.symbol] for trade, _ in priced], dtype=np.int64
+        )
 
-            if trade.action == TradeAction.BUY:
-                total_needed = trade_value + total_cost
-                if new_cash >= total_needed and shares > 0.0:
-                    new_holdings[symbol] = new_holdings.get(symbol, 0.0) + shares
-                    new_cash -= total_needed
-                    num_trades += 1
-                    executed.append(
-                        {
-                            "symbol": symbol,
-                            "action": "buy",
-                            "quantity_shares": float(shares),
-                            "weight_fraction": float(weight_fraction),
-                            "price": float(price),
-                            "gross_value": float(trade_value),
-                            "commission": float(commission),
-                            "slippage": float(slippage),
-                            "total_cost": float(total_cost),
-                            "net_cash_delta": float(-total_needed),
-                            "timestamp": getattr(trade, "timestamp", None) or trade_date,
-                            "reason": getattr(trade, "reason", None),
-                            "score": None
-                            if symbol_scores is None
-                            else float(symbol_scores.get(symbol, np.nan)),
-                        }
-                    )
-
-            elif trade.action == TradeAction.SELL:
-                current_shares = float(new_holdings.get(symbol, 0.0))
-                shares_to_sell = min(current_shares, shares)
-                if shares_to_sell > 0.0:
-                    gross_value = shares_to_sell * price
-                    commission = gross_value * config.commission
-                    slippage = gross_value * config.slippage
-                    total_cost = commission + slippage
-                    proceeds = gross_value - total_cost
-
-                    new_holdings[symbol] = current_shares - shares_to_sell
-                    new_cash += proceeds
-                    num_trades += 1
-                    executed.append(
-                        {
-                            "symbol": symbol,
-                            "action": "sell",
-                            "quantity_shares": float(shares_to_sell),
-                            "weight_fraction": float(weight_fraction),
-                            "price": float(price),
-                            "gross_value": float(gross_value),
-                            "commission": float(commission),
-                            "slippage": float(slippage),
-                            "total_cost": float(total_cost),
-                            "net_cash_delta": float(proceeds),
-                            "timestamp": getattr(trade, "timestamp", None) or trade_date,
-                            "reason": getattr(trade, "reason", None),
-                            "score": None
-                            if symbol_scores is None
-                            else float(symbol_scores.get(symbol, np.nan)),
-                        }
-                    )
-
-                    # Simple heuristic for winning/losing trades
-                    if proceeds > gross_value * 0.95:  # Rough breakeven after costs
-                        winning_trades += 1
-                    else:
-                        losing_trades += 1
+        filled, fills, new_cash = _apply_trades_nb(
+            action_codes,
+            symbol_codes,
+            prices,
+            dollar_values,
+            shares,
+            held,
+            float(cash),
+            float(config.commission),
+            float(config.slippage),
+        )
+        new_cash = float(new_cash)
+
+        # Record fills as one batch gathered from the kernel's columns; symbols
+        # enter new_holdings in order of their first fill
+        fill_rows = np.flatnonzero(filled)
+        fill_symbols = [priced[k][0].symbol for k in fill_rows.tolist()]
+        fill_codes = action_codes[fill_rows]
+        held_after = held.tolist()
+        filled_holdings: Dict[str, float] = {
+            symbol: held_after[symbol_codes_map[symbol]] for symbol in fill_symbols
+        }
+        num_trades = len(fill_symbols)
+        num_sells = int(np.count_nonzero(fill_codes == _ACTION_CODES[TradeAction.SELL]))
+        fill_columns = fills[:, fill_rows]
+        executed.extend(
+            fill_symbols,
+            fill_codes,
+            executed_at,
+            [getattr(priced[k][0], "reason", None) for k in fill_rows.tolist()],
+            None
+            if symbol_scores is None
+            else np.array([symbol_scores.get(symbol, np.nan) for symbol in fill_symbols], dtype=np.float64),
+            quantity_shares=fill_columns[0],
+            weight_fraction=weight_fractions[fill_rows],
+            price=prices[fill_rows],
+            gross_value=fill_columns[1],
+            commission=fill_columns[2],
+            slippage=fill_columns[3],
+            total_cost=fill_columns[4],
+            net_cash_delta=fill_columns[5],
+        )
 
-        return {
+        new_holdings.update(filled_holdings)
+
+        # Simple heuristic for winning/losing trades: a sale "wins" when its proceeds
+        # clear 95% of gross, i.e. exactly when the combined cost rate is under 5%,
+        # which is fixed by the config rather than by any individual trade
+        if config.commission + config.slippage < 0.05:
+            winning_trades, losing_trades = num_sells, 0
+        else:
+            winning_trades, losing_trades = 0, num_sells
+
+        stats = {
             "new_holdings": new_holdings,
+            # Only these symbols' share counts changed
+            "filled_holdings": filled_holdings,
             "new_cash": new_cash,
             "num_trades": num_trades,
             "winning_trades": winning_trades,
             "losing_trades": losing_trades,
-            "executed": executed,
         }
+        if by_column:
+            stats["holdings_vec"] = held
+        if trade_buffer is None:
+            stats["executed"] = executed.to_records()
+        return stats
 
     def _calculate_performance_metrics(
         self,
@@ -489,27 +1170,40 @@ class BacktestingService:
         price_history: Dict[str, pd.DataFrame],
     ) -> Dict:
         """Calculate comprehensive performance metrics."""
-        portfolio_values = simulation_result["portfolio_values"]
-        daily_returns = simulation_result["daily_returns"]
+        portfolio_values = np.asarray(simulation_result["portfolio_values"], dtype=np.float64)
+        daily_returns = np.asarray(simulation_result["daily_returns"], dtype=np.float64)
 
-        if not daily_returns:
+        if daily_returns.size == 0:
             return self._empty_performance_metrics()
 
-        returns_series = pd.Series(daily_returns)
-
         # Basic performance metrics
-        total_return = (portfolio_values[-1] - portfolio_values[0]) / portfolio_values[
-            0
-        ]
+        total_return = float(
+            (portfolio_values[-1] - portfolio_values[0]) / portfolio_values[0]
+        )
         days = len(portfolio_values)
         annualized_return = (1 + total_return) ** (252 / days) - 1 if days > 0 else 0.0
 
-        # Risk metrics
-        volatility = returns_series.std() * np.sqrt(252)
+        # Risk metrics (NaN-skipping, sample std, as pandas reductions were)
+        if NUMBA_AVAILABLE:
+            mean_return, std_return, max_drawdown = _value_path_stats_nb(
+                portfolio_values, daily_returns
+            )
+            max_drawdown = float(max_drawdown)
+        elif daily_returns.size > 1 and np.isfinite(daily_returns).all():
+            # Value paths are NaN-free unless the portfolio hits zero; skip the
+            # NaN-masking copies nanstd/nanmean would make
+            std_return = daily_returns.std(ddof=1)
+            mean_return = daily_returns.mean()
+            max_drawdown = self._calculate_max_drawdown(portfolio_values)
+        else:
+            with np.errstate(divide="ignore", invalid="ignore"):
+                std_return = np.nanstd(daily_returns, ddof=1)
+                mean_return = np.nanmean(daily_returns)
+            max_drawdown = self._calculate_max_drawdown(portfolio_values)
+        volatility = float(std_return) * np.sqrt(252)
         sharpe_ratio = (
-            (returns_series.mean() * 252) / volatility if volatility > 0 else 0.0
+            (float(mean_return) * 252) / volatility if volatility > 0 else 0.0
         )
-        max_drawdown = self._calculate_max_drawdown(portfolio_values)
 
         # Benchmark comparison
         benchmark_metrics = self._calculate_benchmark_metrics(
@@ -538,15 +1232,6 @@ class BacktestingService:
 
         benchmark_df = price_history[benchmark_symbol]
 
-        # Normalize index tz-awareness to tz-naive for safe comparison
-        try:
-            benchmark_df = benchmark_df.tz_localize(None)
-        except Exception:
-            # If not tz-aware or operation unsupported, leave as-is
-            pass
-
-        benchmark_prices = benchmark_df["close"]
-
         # Filter to backtest period using tz-naive date bounds
         start_bound = start_date
         end_bound = end_date
@@ -558,15 +1243,21 @@ class BacktestingService:
         except Exception:
             pass
 
-        mask = (benchmark_df.index >= start_bound) & (benchmark_df.index <= end_bound)
-        benchmark_prices = benchmark_prices[mask]
+        # Sorted nanosecond index: the period is rows [lo, hi) and only its endpoints
+        # are needed. Both bounds come from one search over the raw int64 stamps;
+        # searching left of end + 1ns is searching right of end
+        bounds = np.array(
+            [np.datetime64(start_bound, "ns"), np.datetime64(end_bound, "ns")]
+        ).view(np.int64)
+        bounds[1] += 1
+        lo, hi = benchmark_df.index.asi8.searchsorted(bounds).tolist()
 
-        if len(benchmark_prices) < 2:
+        if hi - lo < 2:
             return {"benchmark_return": 0.0, "alpha": 0.0, "beta": 1.0}
 
-        benchmark_return = (
-            benchmark_prices.iloc[-1] - benchmark_prices.iloc[0]
-        ) / benchmark_prices.iloc[0]
+        closes = benchmark_df["close"].to_numpy(dtype=np.float64)
+        first_close, last_close = closes[lo], closes[hi - 1]
+        benchmark_return = float((last_close - first_close) / first_close)
 
         return {
             "benchmark_return": benchmark_return,
@@ -576,24 +1267,55 @@ class BacktestingService:
 
     def _calculate_max_drawdown(self, values: List[float]) -> float:
         """Calculate maximum drawdown from a series of portfolio values."""
-        if not values:
+        values_arr = np.asarray(values, dtype=np.float64)
+        if values_arr.size == 0:
             return 0.0
 
-        peak = values[0]
-        max_dd = 0.0
-
-        for value in values:
-            if value > peak:
-                peak = value
-            drawdown = (peak - value) / peak
-            max_dd = max(max_dd, drawdown)
+        # Running peak, then drawdown in place; non-positive peaks count as no drawdown
+        peaks = np.maximum.accumulate(values_arr)
+        drawdowns = np.subtract(peaks, values_arr)
+        np.divide(drawdowns, peaks, out=drawdowns, where=peaks > 0)
+        drawdowns[peaks <= 0] = 0.0
+        return float(drawdowns.max())
 
-        return max_dd
+    def _rebalance_schedule(self, market: _MarketData, frequency: str) -> np.ndarray:
+        """
+        For every simulation row, the first row of the following rebalance period.
 
-    def _get_rebalance_frequency_days(self, frequency: str) -> int:
-        """Convert rebalance frequency string to days."""
-        frequency_map = {"daily": 1, "weekly": 7, "monthly": 30, "quarterly": 90}
-        return frequency_map.get(frequency.lower(), 30)
+        Fixed by the dates and frequency alone, so it is computed once per market and
+        period code and reused by every run on that market.
+        """
+        period_code = _REBALANCE_PERIODS.get(frequency.lower(), "M")
+        next_due = market.rebalance_schedules.get(period_code)
+        if next_due is None:
+            # Start row of every period plus an end sentinel; a row is next due at
+            # the start of the period after its own
+            is_start = self._build_rebalance_mask(market.dates, frequency)
+            period_starts = np.append(np.flatnonzero(is_start)[1:], len(is_start))
+            next_due = period_starts[np.cumsum(is_start) - 1]
+            next_due.setflags(write=False)
+            market.rebalance_schedules[period_code] = next_due
+        return next_due
+
+    def _build_rebalance_mask(
+        self, dates: pd.DatetimeIndex, frequency: str
+    ) -> np.ndarray:
+        """Flag the first date of each calendar period for the rebalance frequency."""
+        if len(dates) == 0:
+            return np.zeros(0, dtype=bool)
+        # Integer period ordinals straight from datetime64 units, matching
+        # to_period(): days since the epoch, weeks ending Sunday (the epoch is a
+        # Thursday, so shift by 3 days), calendar months and quarters
+        period_code = _REBALANCE_PERIODS.get(frequency.lower(), "M")
+        if period_code in ("D", "W"):
+            periods = dates.values.astype("datetime64[D]").view(np.int64)
+            if period_code == "W":
+                periods = (periods + 3) // 7
+        else:
+            periods = dates.values.astype("datetime64[M]").view(np.int64)
+            if period_code == "Q":
+                periods = periods // 3
+        return np.r_[True, periods[1:] != periods[:-1]]
 
     def _empty_performance_metrics(self) -> Dict:
         """Return empty performance metrics for error cases."""
@@ -607,3 +1329,28 @@ class BacktestingService:
             "alpha": 0.0,
             "beta": 1.0,
         }
+
+
+# Per-process state for run_backtests_batch's process pool: the shared market is
+# sent once per worker by the pool initializer instead of once per run
+_BATCH_WORKER_STATE: Optional[Tuple[Any, ...]] = None
+
+
+def _init_batch_worker(
+    backtest_config: BacktestConfig,
+    initial_holdings: Dict[str, float],
+    price_history: Dict[str, pd.DataFrame],
+    market: _MarketData,
+) -> None:
+    global _BATCH_WORKER_STATE
+    # Simulation never touches the data service; the market is already prepared
+    service = BacktestingService(data_service=None)
+    _BATCH_WORKER_STATE = (service, backtest_config, initial_holdings, price_history, market)
+
+
+def _run_batch_job(run: Tuple[StrategyProtocol, StrategyConfig]) -> BacktestResult:
+    service, backtest_config, initial_holdings, price_history, market = _BATCH_WORKER_STATE
+    strategy, strategy_config = run
+    return service._backtest_on_market(
+        strategy, strategy_config, backtest_config, initial_holdings, price_history, market
+    )
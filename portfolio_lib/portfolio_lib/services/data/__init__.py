@@ -1,22 +1,52 @@
 """
 Data services package - Market data providers and abstractions.
+
+Provider and cache classes are imported on first access (PEP 562
+``__getattr__``), so importing the package, or just ``DataService``, does not
+load every provider.
 """
 
+import importlib
+import importlib.util
+
 from .base import DataService
-from .yfinance import YFinanceDataService
 
-# AlphaVantage is optional - only import if alpha-vantage is installed
-try:
-    from .alphavantage import AlphaVantageDataService
-    _ALPHAVANTAGE_AVAILABLE = True
-except ImportError:
-    _ALPHAVANTAGE_AVAILABLE = False
-    AlphaVantageDataService = None
+# Lazily loaded class -> defining submodule, resolved by __getattr__ below
+_SUBMODULES = {
+    "YFinanceDataService": ".yfinance",
+    "AlphaVantageDataService": ".alphavantage",
+    "CachedDataService": ".cache",
+    "ParquetCache": ".cache",
+}
 
 __all__ = [
     "DataService",
     "YFinanceDataService",
+    "CachedDataService",
+    "ParquetCache",
 ]
 
-if _ALPHAVANTAGE_AVAILABLE:
+# AlphaVantage is optional - only exported if alpha-vantage is installed; probing
+# the spec keeps the provider itself unloaded until first access
+if importlib.util.find_spec("alpha_vantage") is not None:
     __all__.append("AlphaVantageDataService")
+
+
+def __getattr__(name: str):
+    module_name = _SUBMODULES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    try:
+        value = getattr(importlib.import_module(module_name, __name__), name)
+    except ImportError:
+        # AlphaVantage is optional - None if its module cannot be imported
+        if name != "AlphaVantageDataService":
+            raise
+        value = None
+    # Cache on the module so later lookups skip __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -17,6 +17,10 @@ logger = logging.getLogger(__name__)
 class AlphaVantageDataService:
     """Data service implementation using Alpha Vantage API."""
     
+    QUERY_URL = "https://www.alphavantage.co/query"
+    # Most symbols a single batch quote request accepts
+    BATCH_QUOTE_LIMIT = 100
+    
     def __init__(self, api_key: str, requests_per_minute: int = 5):
         """
         Initialize the AlphaVantage data service.
@@ -32,6 +36,8 @@ class AlphaVantageDataService:
         self.requests_per_minute = requests_per_minute
         self._last_request_time = 0.0
         self._request_interval = 60.0 / requests_per_minute  # seconds between requests
+        # Cleared once the batch quote endpoint is refused for this API key
+        self._batch_quotes_available = True
         
         try:
             from alpha_vantage.timeseries import TimeSeries
@@ -76,6 +82,8 @@ class AlphaVantageDataService:
         logger.info(f"Fetching price history for {len(symbols)} symbols from {start_date} to {end_date}")
         
         result = {}
+        start_dt = pd.to_datetime(start_date)
+        end_dt = pd.to_datetime(end_date)
         
         for i, symbol in enumerate(symbols):
             try:
@@ -90,13 +98,16 @@ class AlphaVantageDataService:
                     logger.warning(f"No data found for symbol {symbol}")
                     continue
                 
-                # Filter by date range
-                start_dt = pd.to_datetime(start_date)
-                end_dt = pd.to_datetime(end_date)
-                
-                # Alpha Vantage returns data with newest first, so we need to filter
-                mask = (data.index >= start_dt) & (data.index <= end_dt)
-                filtered_data = data.loc[mask]
+                # Alpha Vantage returns data with newest first; put it oldest first
+                # (a reversed view when it is descending) so the date range
+                # is one positional slice instead of a mask over the full history
+                if data.index.is_monotonic_decreasing:
+                    data = data.iloc[::-1]
+                elif not data.index.is_monotonic_increasing:
+                    data = data.sort_index()
+                lo = data.index.searchsorted(start_dt, side='left')
+                hi = data.index.searchsorted(end_dt, side='right')
+                filtered_data = data.iloc[lo:hi]
                 
                 if filtered_data.empty:
                     logger.warning(f"No data in date range for {symbol}")
@@ -116,9 +127,6 @@ class AlphaVantageDataService:
                 # Add adjusted_close as same as close for consistency
                 standardized_data['adjusted_close'] = standardized_data['close']
                 
-                # Sort by date (oldest first)
-                standardized_data = standardized_data.sort_index()
-                
                 result[symbol] = standardized_data
                 logger.debug(f"Successfully fetched {len(standardized_data)} days of data for {symbol}")
                 
@@ -141,13 +149,18 @@ class AlphaVantageDataService:
         """
         logger.info(f"Fetching current prices for {len(symbols)} symbols")
         
-        result = {}
+        # One request per chunk of symbols; only symbols the batch endpoint did not
+        # return fall back to a rate-limited quote call each
+        result = self._fetch_batch_quotes(symbols)
+        missing = [symbol for symbol in symbols if symbol not in result]
+        if missing and result:
+            logger.debug(f"Batch quotes missing {len(missing)} symbols, fetching individually")
         
-        for i, symbol in enumerate(symbols):
+        for i, symbol in enumerate(missing):
             try:
                 self._rate_limit()
                 
-                logger.debug(f"Fetching current price for {symbol} ({i+1}/{len(symbols)})")
+                logger.debug(f"Fetching current price for {symbol} ({i+1}/{len(missing)})")
                 
                 # Use quote endpoint for current price
                 data, meta_data = self._ts.get_quote_endpoint(symbol=symbol)
@@ -167,9 +180,77 @@ class AlphaVantageDataService:
                 logger.error(f"Error fetching current price for {symbol}: {e}")
                 continue
         
+        # Report prices in the requested order
+        result = {symbol: result[symbol] for symbol in symbols if symbol in result}
         logger.info(f"Successfully fetched current prices for {len(result)} out of {len(symbols)} symbols")
         return result
     
+    def _fetch_batch_quotes(self, symbols: List[str]) -> Dict[str, float]:
+        """
+        Fetch latest prices for many symbols with the batch quote endpoint.
+        
+        Sends one rate-limited request per chunk of up to ``BATCH_QUOTE_LIMIT``
+        symbols. Symbols missing from the responses (all of them, if the endpoint
+        is unavailable for the API key) are left out for the caller to retry.
+        Once the endpoint is refused, later calls skip it and return nothing.
+        
+        Args:
+            symbols: List of stock symbols
+            
+        Returns:
+            Dictionary mapping the symbols that were quoted to their prices
+        """
+        import requests
+        
+        prices = {}
+        if not self._batch_quotes_available:
+            return prices
+        
+        for start in range(0, len(symbols), self.BATCH_QUOTE_LIMIT):
+            chunk = symbols[start:start + self.BATCH_QUOTE_LIMIT]
+            try:
+                self._rate_limit()
+                response = requests.get(
+                    self.QUERY_URL,
+                    params={
+                        "function": "BATCH_STOCK_QUOTES",
+                        "symbols": ",".join(chunk),
+                        "apikey": self.api_key,
+                    },
+                    timeout=30,
+                )
+                response.raise_for_status()
+                payload = response.json()
+            except Exception as e:
+                logger.warning(f"Batch quote request failed for {len(chunk)} symbols: {e}")
+                continue
+            
+            # Errors come back with HTTP 200 and a message instead of quotes
+            if not isinstance(payload, dict) or "Stock Quotes" not in payload:
+                details = payload if isinstance(payload, dict) else {}
+                if "Note" in details:
+                    # Rate limit notice: the remaining chunks would be refused too
+                    logger.warning(f"Batch quotes throttled: {details['Note']}")
+                else:
+                    message = details.get("Error Message") or details.get("Information") or payload
+                    logger.warning(
+                        f"Batch quotes unavailable, using per-symbol quotes from now on: {message}"
+                    )
+                    self._batch_quotes_available = False
+                break
+            quotes = payload["Stock Quotes"] or []
+            
+            requested = set(chunk)
+            for quote in quotes:
+                try:
+                    symbol = quote["1. symbol"]
+                    if symbol in requested:
+                        prices[symbol] = float(quote["2. price"])
+                except (KeyError, TypeError, ValueError):
+                    continue
+        
+        return prices
+    
     def get_data_source_name(self) -> str:
         """Return the data source name."""
         return "alphavantage"
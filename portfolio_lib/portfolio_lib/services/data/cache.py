@@ -0,0 +1,312 @@
+"""
+On-disk cache for fetched price history.
+
+Closed trading days never change, so history fetched once can be served from
+disk to later runs and processes instead of the network. ``ParquetCache`` stores
+one parquet file per key (requires pyarrow or fastparquet, e.g. the ``perf``
+extra); ``fetch_price_history_cached`` layers per-symbol reuse on top of any
+``DataService``, fetching only the symbols and trailing days the cache lacks.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+import pandas as pd
+
+from .base import DataService
+
+logger = logging.getLogger(__name__)
+
+# Default cache location, and how long an entry is trusted before its last rows are refetched
+DEFAULT_CACHE_DIR = Path.home() / ".portfolio_lib" / "cache"
+DEFAULT_TTL_SECONDS = 24 * 60 * 60.0
+
+
+class ParquetCache:
+    """
+    File-backed DataFrame cache: one parquet file, plus optional JSON metadata, per key.
+
+    Entries live at ``root/namespace/key.parquet``. An entry is fresh for
+    ``ttl_seconds`` after it was written (``None`` never expires); stale entries
+    stay readable with ``allow_stale=True`` so callers can refresh them
+    incrementally. Read and write failures are logged and treated as misses.
+    """
+
+    def __init__(
+        self,
+        root: Optional[Union[str, Path]] = None,
+        ttl_seconds: Optional[float] = DEFAULT_TTL_SECONDS,
+    ):
+        """
+        Args:
+            root: Cache directory (defaults to ``~/.portfolio_lib/cache``)
+            ttl_seconds: Seconds an entry stays fresh; None never expires
+        """
+        self.root = Path(root).expanduser() if root is not None else DEFAULT_CACHE_DIR
+        self.ttl_seconds = ttl_seconds
+
+    @staticmethod
+    def make_key(*parts: object) -> str:
+        """Stable, file-name-safe key for the given parts."""
+        return hashlib.blake2b(repr(parts).encode(), digest_size=16).hexdigest()
+
+    def path(self, key: str, namespace: str = "") -> Path:
+        """Parquet file for ``key``; its metadata sits next to it as ``.json``."""
+        return self.root / namespace / f"{key}.parquet"
+
+    def is_fresh(self, key: str, namespace: str = "") -> bool:
+        """Whether the entry exists and was written within the TTL."""
+        try:
+            written = self.path(key, namespace).stat().st_mtime
+        except OSError:
+            return False
+        return self.ttl_seconds is None or time.time() - written <= self.ttl_seconds
+
+    def get(
+        self, key: str, namespace: str = "", allow_stale: bool = False
+    ) -> Optional[pd.DataFrame]:
+        """The cached frame, or None if missing, unreadable, or stale (unless allowed)."""
+        path = self.path(key, namespace)
+        if not path.exists() or not (allow_stale or self.is_fresh(key, namespace)):
+            return None
+        try:
+            return self._read_frame(path)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable cache entry {path}: {e}")
+            return None
+
+    def get_meta(self, key: str, namespace: str = "") -> Dict[str, Any]:
+        """Metadata stored with the entry, or an empty dict."""
+        try:
+            return json.loads(self.path(key, namespace).with_suffix(".json").read_text())
+        except (OSError, ValueError):
+            return {}
+
+    def set(
+        self,
+        key: str,
+        df: pd.DataFrame,
+        namespace: str = "",
+        meta: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Store ``df`` (and ``meta``) under ``key``; each file is replaced atomically."""
+        path = self.path(key, namespace)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._atomic_write(path, lambda tmp: self._write_frame(df, tmp))
+            if meta is not None:
+                self._atomic_write(
+                    path.with_suffix(".json"), lambda tmp: tmp.write_text(json.dumps(meta))
+                )
+        except Exception as e:
+            logger.warning(f"Could not write cache entry {path}: {e}")
+
+    @staticmethod
+    def _atomic_write(path: Path, write: Callable[[Path], Any]) -> None:
+        # Readers (other processes included) see the old file or the new one, never
+        # half; each write gets its own temp file so concurrent writers of a key
+        # (threads included) cannot replace each other's partial output
+        fd, name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+        os.close(fd)
+        tmp = Path(name)
+        try:
+            write(tmp)
+            os.replace(tmp, path)
+        finally:
+            tmp.unlink(missing_ok=True)
+
+    @staticmethod
+    def _read_frame(path: Path) -> pd.DataFrame:
+        return pd.read_parquet(path)
+
+    @staticmethod
+    def _write_frame(df: pd.DataFrame, path: Path) -> None:
+        df.to_parquet(path, compression="zstd")
+
+
+def fetch_price_history_cached(
+    data_service: DataService,
+    cache: ParquetCache,
+    symbols: List[str],
+    start_date: str,
+    end_date: str,
+) -> Dict[str, pd.DataFrame]:
+    """
+    ``data_service.fetch_price_history`` with per-symbol reuse from ``cache``.
+
+    Each symbol keeps one entry per data source, recording the date range it was
+    fetched for. A request inside that range is served from the entry, trimmed to
+    the request. When the request ends after the entry, or the entry is stale and
+    the request reaches its last row (which may have been an unfinished day), only
+    the days from that row onward are fetched and appended. A request starting
+    before the entry is fetched in full, together with symbols without an entry.
+    Entries only ever grow, and symbols needing the same fetch share one call.
+    """
+    source = data_service.get_data_source_name()
+    start, end = pd.Timestamp(start_date), pd.Timestamp(end_date)
+    result: Dict[str, pd.DataFrame] = {}
+    # Last day to fetch -> symbols fetched in full from start_date
+    missing: Dict[str, List[str]] = {}
+    # (first day, last day) to refetch -> [(symbol, cached frame, entry metadata)]
+    tails: Dict[Tuple[str, str], List[Any]] = {}
+
+    for symbol in symbols:
+        key = cache.make_key(source, symbol)
+        meta = cache.get_meta(key, source)
+        entry_range = _entry_range(meta)
+        cached = cache.get(key, source, allow_stale=True) if entry_range else None
+        # The row count guards against a frame and metadata from different writes
+        if cached is None or cached.empty or len(cached) != meta.get("rows"):
+            missing.setdefault(end_date, []).append(symbol)
+            continue
+        entry_start, entry_end = entry_range
+        fetch_end = max(end, entry_end).strftime("%Y-%m-%d")
+        if start < entry_start:
+            # Refetch the union so the entry does not shrink
+            missing.setdefault(fetch_end, []).append(symbol)
+            continue
+        last_day = cached.index[-1].tz_localize(None).normalize()
+        if end > entry_end or (end >= last_day and not cache.is_fresh(key, source)):
+            tail = (last_day.strftime("%Y-%m-%d"), fetch_end)
+            tails.setdefault(tail, []).append((symbol, cached, meta))
+        else:
+            result[symbol] = _window(cached, start, end)
+
+    for fetch_end, group in missing.items():
+        fetched = data_service.fetch_price_history(group, start_date, fetch_end)
+        store_price_history(cache, source, fetched, start_date, fetch_end)
+        for symbol, df in fetched.items():
+            result[symbol] = _window(df, start, end)
+
+    for (tail_start, tail_end), entries in tails.items():
+        fetched = data_service.fetch_price_history(
+            [symbol for symbol, _, _ in entries], tail_start, tail_end
+        )
+        for symbol, cached, meta in entries:
+            recent = fetched.get(symbol)
+            if recent is None or recent.empty:
+                # Keep serving what is cached; the entry is retried next time
+                result[symbol] = _window(cached, start, end)
+                continue
+            # Replace the cached last day and anything after it with the fresh rows
+            kept = cached.iloc[: cached.index.searchsorted(cached.index[-1].normalize())]
+            merged = pd.concat([kept, recent])
+            merged = merged[~merged.index.duplicated(keep="last")].sort_index()
+            cache.set(
+                cache.make_key(source, symbol),
+                merged,
+                source,
+                meta={"start": meta["start"], "end": tail_end, "rows": len(merged)},
+            )
+            result[symbol] = _window(merged, start, end)
+
+    logger.debug(
+        f"Price history for {len(symbols)} symbols: "
+        f"{sum(len(group) for group in missing.values())} fetched in full, "
+        f"{sum(len(entries) for entries in tails.values())} extended from cache"
+    )
+    return {symbol: result[symbol] for symbol in symbols if symbol in result}
+
+
+def store_price_history(
+    cache: ParquetCache,
+    source: str,
+    history: Dict[str, pd.DataFrame],
+    start_date: str,
+    end_date: str,
+) -> None:
+    """
+    Record freshly fetched history for ``[start_date, end_date]`` in each symbol's entry.
+
+    Cached rows outside that range are kept when the two ranges overlap. A
+    disjoint entry is only replaced by a range at least as long, so entries never
+    shrink.
+    """
+    for symbol, df in history.items():
+        if df.empty:
+            continue
+        start, end = pd.Timestamp(start_date), pd.Timestamp(end_date)
+        key = cache.make_key(source, symbol)
+        meta = cache.get_meta(key, source)
+        entry_range = _entry_range(meta)
+        if entry_range and (entry_range[0] < start or entry_range[1] > end):
+            entry_start, entry_end = entry_range
+            cached = cache.get(key, source, allow_stale=True)
+            if cached is not None and len(cached) == meta.get("rows"):
+                if entry_start <= end and start <= entry_end:
+                    before = _window(cached, entry_start, start - pd.Timedelta(days=1))
+                    after = _window(cached, end + pd.Timedelta(days=1), entry_end)
+                    df = pd.concat([before, df, after])
+                    start, end = min(start, entry_start), max(end, entry_end)
+                elif entry_end - entry_start > end - start:
+                    continue
+        cache.set(
+            key,
+            df,
+            source,
+            meta={
+                "start": start.strftime("%Y-%m-%d"),
+                "end": end.strftime("%Y-%m-%d"),
+                "rows": len(df),
+            },
+        )
+
+
+def _entry_range(meta: Dict[str, Any]) -> Optional[Tuple[pd.Timestamp, pd.Timestamp]]:
+    """The (start, end) days an entry was fetched for, or None if its metadata is unusable."""
+    try:
+        return pd.Timestamp(meta["start"]), pd.Timestamp(meta["end"])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def _window(df: pd.DataFrame, start: pd.Timestamp, end: pd.Timestamp) -> pd.DataFrame:
+    """Rows dated from ``start`` through the day ``end`` in a sorted frame, in the index's timezone."""
+    stop = end.normalize() + pd.Timedelta(days=1)
+    tz = getattr(df.index, "tz", None)
+    if tz is not None:
+        start, stop = start.tz_localize(tz), stop.tz_localize(tz)
+    return df.iloc[df.index.searchsorted(start) : df.index.searchsorted(stop)]
+
+
+class CachedDataService:
+    """
+    DataService wrapper that serves price history through a ``ParquetCache``.
+
+    Current prices and market status pass straight through to the wrapped service.
+    """
+
+    def __init__(self, data_service: DataService, cache: Optional[ParquetCache] = None):
+        """
+        Args:
+            data_service: Service that fetches what the cache does not have
+            cache: Cache to use (defaults to ``ParquetCache()`` under ``~/.portfolio_lib``)
+        """
+        self.data_service = data_service
+        self.cache = cache if cache is not None else ParquetCache()
+
+    def fetch_price_history(
+        self, symbols: List[str], start_date: str, end_date: str
+    ) -> Dict[str, pd.DataFrame]:
+        """Fetch historical price data, reusing cached days where possible."""
+        return fetch_price_history_cached(
+            self.data_service, self.cache, symbols, start_date, end_date
+        )
+
+    def fetch_current_prices(self, symbols: List[str]) -> Dict[str, float]:
+        """Fetch current market prices from the wrapped service."""
+        return self.data_service.fetch_current_prices(symbols)
+
+    def get_data_source_name(self) -> str:
+        """Return the wrapped service's data source name."""
+        return self.data_service.get_data_source_name()
+
+    def is_market_open(self) -> bool:
+        """Check if the market is open, per the wrapped service."""
+        return self.data_service.is_market_open()
@@ -6,7 +6,8 @@ using the yfinance library to fetch market data from Yahoo Finance.
 """
 
 import logging
-from typing import Dict, List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
 from datetime import datetime
 import pandas as pd
 
@@ -16,8 +17,15 @@ logger = logging.getLogger(__name__)
 class YFinanceDataService:
     """Data service implementation using yfinance."""
     
-    def __init__(self):
-        """Initialize the YFinance data service."""
+    def __init__(self, max_workers: int = 8):
+        """
+        Initialize the YFinance data service.
+        
+        Args:
+            max_workers: Most ticker histories to download concurrently; 1 fetches
+                them one after another
+        """
+        self.max_workers = max(1, int(max_workers))
         try:
             import yfinance as yf
             self._yf = yf
@@ -46,40 +54,52 @@ class YFinanceDataService:
         """
         logger.info(f"Fetching price history for {len(symbols)} symbols from {start_date} to {end_date}")
         
-        result = {}
+        # Each history is an independent, I/O-bound request; download them on a
+        # thread pool and keep the requested symbol order
+        workers = min(self.max_workers, len(symbols))
+        if workers > 1:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                frames = list(
+                    executor.map(lambda symbol: self._fetch_one(symbol, start_date, end_date), symbols)
+                )
+        else:
+            frames = [self._fetch_one(symbol, start_date, end_date) for symbol in symbols]
         
-        for symbol in symbols:
-            try:
-                ticker = self._yf.Ticker(symbol)
-                
-                # Fetch historical data
-                hist = ticker.history(start=start_date, end=end_date)
-                
-                if hist.empty:
-                    logger.warning(f"No data found for symbol {symbol}")
-                    continue
-                
-                # Standardize column names (yfinance uses title case)
-                hist.columns = hist.columns.str.lower()
-                
-                # Ensure we have the required columns
-                required_columns = ['open', 'high', 'low', 'close', 'volume']
-                missing_columns = [col for col in required_columns if col not in hist.columns]
-                
-                if missing_columns:
-                    logger.warning(f"Missing columns for {symbol}: {missing_columns}")
-                    continue
-                
-                result[symbol] = hist
-                logger.debug(f"Successfully fetched {len(hist)} days of data for {symbol}")
-                
-            except Exception as e:
-                logger.error(f"Error fetching data for {symbol}: {e}")
-                continue
+        result = {symbol: hist for symbol, hist in zip(symbols, frames) if hist is not None}
         
         logger.info(f"Successfully fetched data for {len(result)} out of {len(symbols)} symbols")
         return result
     
+    def _fetch_one(self, symbol: str, start_date: str, end_date: str) -> Optional[pd.DataFrame]:
+        """Fetch one symbol's history with lower-case OHLCV columns, or None if unavailable."""
+        try:
+            ticker = self._yf.Ticker(symbol)
+            
+            # Fetch historical data
+            hist = ticker.history(start=start_date, end=end_date)
+            
+            if hist.empty:
+                logger.warning(f"No data found for symbol {symbol}")
+                return None
+            
+            # Standardize column names (yfinance uses title case)
+            hist.columns = hist.columns.str.lower()
+            
+            # Ensure we have the required columns
+            required_columns = ['open', 'high', 'low', 'close', 'volume']
+            missing_columns = [col for col in required_columns if col not in hist.columns]
+            
+            if missing_columns:
+                logger.warning(f"Missing columns for {symbol}: {missing_columns}")
+                return None
+            
+            logger.debug(f"Successfully fetched {len(hist)} days of data for {symbol}")
+            return hist
+            
+        except Exception as e:
+            logger.error(f"Error fetching data for {symbol}: {e}")
+            return None
+    
     def fetch_current_prices(self, symbols: List[str]) -> Dict[str, float]:
         """
         Fetch current market prices using yfinance.
@@ -106,20 +126,21 @@ class YFinanceDataService:
                     result[symbol] = float(data['Close'].iloc[-1])
                     
             else:
-                # Multiple symbols case
+                # Multiple symbols case: take every ticker's last close in one
+                # cross-section and drop missing quotes in one pass
+                if data.empty or 'Close' not in data.columns.get_level_values(1):
+                    last_closes = pd.Series(dtype=float)
+                else:
+                    last_closes = data.xs('Close', axis=1, level=1).iloc[-1]
+                quoted = last_closes[last_closes.notna()]
+                prices = dict(zip(quoted.index, quoted.astype(float).tolist()))
                 for symbol in symbols:
-                    try:
-                        if symbol in data.columns.levels[0]:
-                            close_price = data[symbol]['Close'].iloc[-1]
-                            if pd.notna(close_price):
-                                result[symbol] = float(close_price)
-                            else:
-                                logger.warning(f"NaN price for {symbol}")
-                        else:
-                            logger.warning(f"No data found for {symbol}")
-                    except (KeyError, IndexError) as e:
-                        logger.warning(f"Error getting current price for {symbol}: {e}")
-                        continue
+                    if symbol in prices:
+                        result[symbol] = prices[symbol]
+                    elif symbol in last_closes.index:
+                        logger.warning(f"NaN price for {symbol}")
+                    else:
+                        logger.warning(f"No data found for {symbol}")
                         
         except Exception as e:
             logger.error(f"Error fetching current prices: {e}")
@@ -29,7 +29,12 @@ class StrategyProtocol(Protocol):
         current_prices: Dict[str, float],
         config: StrategyConfig
     ) -> StrategyResult:
-        """Execute the strategy and return recommendations."""
+        """
+        Execute the strategy and return recommendations.
+        
+        ``price_history`` frames may be shared with the caller's caches; copy one
+        before modifying it.
+        """
         ...
 
 
@@ -174,30 +174,37 @@ def _plot_growth_with_benchmark(
     return fig
 
 
+def _allocation_weights(holdings: pd.DataFrame, closes: pd.DataFrame) -> pd.DataFrame:
+    """
+    Position weights per row of ``closes`` (already aligned to the result timestamps),
+    from the result's holdings frame (NaN where a symbol is not held).
+    """
+    prices = closes.to_numpy(dtype=np.float64)
+    n = min(len(prices), len(holdings))
+    shares = np.zeros(prices.shape, dtype=np.float64)
+    held = np.zeros(len(prices), dtype=bool)
+    shares[:n] = holdings.reindex(columns=closes.columns).to_numpy(dtype=np.float64)[:n]
+    held[:n] = holdings.notna().to_numpy().any(axis=1)[:n]
+    shares = np.nan_to_num(shares, nan=0.0)
+    pos_val = shares * prices
+    pos_val[~held] = 0.0
+    tot = np.nansum(pos_val, axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        weights = np.where((tot > 0)[:, None], pos_val / tot[:, None], pos_val)
+    return pd.DataFrame(weights, index=closes.index, columns=closes.columns)
+
+
 def _plot_allocations(res, price_history: Dict[str, pd.DataFrame]) -> Optional[Any]:
     import importlib
 
     go = importlib.import_module("plotly.graph_objects")
     idx = pd.to_datetime(res.timestamps)
-    if not getattr(res, "holdings_history", None) or len(idx) == 0:
+    if getattr(res, "holdings_matrix", None) is None or len(idx) == 0:
         return None
     closes = _build_close_frame(price_history).reindex(idx).ffill()
     if closes.empty:
         return None
-    # Build weights over time
-    weights = []
-    for i, ts in enumerate(idx):
-        hh = res.holdings_history[i] if i < len(res.holdings_history) else {}
-        if not hh:
-            weights.append(pd.Series(0.0, index=closes.columns))
-            continue
-        prices = closes.loc[ts].reindex(closes.columns).astype(float)
-        pos_val = pd.Series({k: float(hh.get(k, 0.0)) for k in closes.columns}) * prices
-        tot = float(pos_val.sum())
-        w = (pos_val / tot) if tot > 0 else pos_val
-        weights.append(w)
-    wdf = pd.concat(weights, axis=1).T
-    wdf.index = idx
+    wdf = _allocation_weights(res.holdings_frame(), closes)
     # Order symbols by mean weight and include all for fidelity
     means = wdf.mean().sort_values(ascending=False)
     ordered_cols = list(means.index)
@@ -271,7 +278,7 @@ def _plot_trades(res, price_history: Dict[str, pd.DataFrame]) -> Optional[Any]:
     if not trades:
         return None
     # pick the most-traded symbol that has price data
-    df_tr = pd.DataFrame(trades)
+    df_tr = res.executed_trades_frame()
     if "symbol" not in df_tr.columns:
         return None
     counts = df_tr["symbol"].value_counts() if not df_tr.empty else pd.Series(dtype=int)
@@ -444,6 +451,7 @@ def _run_backtest_on_code(
         commission=commission,
         slippage=slippage,
         benchmark=benchmark,
+        capture_diagnostics=True,
     )
     price_history = data.fetch_price_history(
         symbols, start_date.strftime("%Y-%m-%d"), end_date.strftime("%Y-%m-%d")
@@ -957,6 +965,7 @@ def main():
                     commission=commission,
                     slippage=slippage,
                     benchmark=benchmark,
+                    capture_diagnostics=True,
                 )
                 # initial holdings: equal capital at first price available
                 price_history = data.fetch_price_history(
@@ -1020,7 +1029,7 @@ def main():
                     # Trades table with scores
                     if getattr(res, "executed_trades", None):
                         st.markdown("### Executed Trades")
-                        df_tr = pd.DataFrame(res.executed_trades)
+                        df_tr = res.executed_trades_frame()
                         # tidy columns
                         if "timestamp" in df_tr.columns:
                             df_tr["timestamp"] = pd.to_datetime(df_tr["timestamp"])
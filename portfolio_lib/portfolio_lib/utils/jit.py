@@ -0,0 +1,30 @@
+"""
+Optional Numba JIT support.
+
+Numba is an optional dependency (``pip install portfolio-lib[perf]``). When it is
+not installed, ``njit`` is a no-op decorator and ``prange`` is ``range``, so
+kernels decorated here still run as plain Python. Callers that have a faster
+NumPy formulation should check ``NUMBA_AVAILABLE`` and use it instead of the
+interpreted kernel.
+"""
+
+try:
+    from numba import njit, prange
+
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit supporting both @njit and @njit(...)."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+
+        return decorator
+
+
+__all__ = ["njit", "prange", "NUMBA_AVAILABLE"]
@@ -0,0 +1,586 @@
+"""
+Tests for the BacktestingService.
+"""
+
+import pytest
+from dataclasses import replace
+from datetime import datetime
+import pandas as pd
+import numpy as np
+
+from portfolio_lib.models.strategy import BacktestConfig, StrategyConfig, Trade, TradeAction
+from portfolio_lib.services.backtesting import backtester
+from portfolio_lib.services.backtesting.backtester import (
+    BacktestingService,
+    _HistoryView,
+    _TradeBuffer,
+    _value_path_stats_nb,
+    warm_up_kernels,
+)
+from portfolio_lib.services.strategy import MomentumStrategy, BollingerAttractivenessStrategy
+
+
+class MockDataService:
+    """Deterministic data service with a gappy and a tz-aware symbol."""
+
+    def __init__(self):
+        self.fetch_price_history_calls = 0
+
+    def fetch_price_history(self, symbols, start_date, end_date):
+        self.fetch_price_history_calls += 1
+        dates = pd.bdate_range("2022-01-01", "2023-06-30")
+        result = {}
+
+        for i, symbol in enumerate(symbols):
+            rng = np.random.default_rng(i + 1)
+            prices = 50.0 * (i + 1) * np.exp(np.cumsum(rng.normal(0.0005, 0.015, len(dates))))
+            df = pd.DataFrame({
+                'open': prices,
+                'high': prices * 1.01,
+                'low': prices * 0.99,
+                'close': prices,
+                'volume': 1000000
+            }, index=dates)
+
+            if symbol == "NVDA":
+                df = df.drop(df.index[::11])  # missing quotes
+            if i % 2 == 0:
+                df = df.tz_localize("America/New_York")
+
+            result[symbol] = df
+
+        return result
+
+    def fetch_current_prices(self, symbols):
+        raise AssertionError("backtests must not fetch current prices")
+
+    def get_data_source_name(self):
+        return "mock"
+
+    def is_market_open(self):
+        return False
+
+
+class TestBacktestingService:
+    """Test cases for BacktestingService."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.data_service = MockDataService()
+        self.service = BacktestingService(self.data_service)
+        self.holdings = {"AAPL": 100.0, "MSFT": 50.0, "NVDA": 80.0, "GOOGL": 20.0}
+        self.backtest_config = BacktestConfig(
+            start_date=datetime(2022, 3, 1),
+            end_date=datetime(2023, 3, 31),
+            initial_capital=100000.0,
+            benchmark="SPY",
+            capture_diagnostics=True,
+        )
+
+    def _run(self, strategy, frequency="monthly", parameters=None):
+        strategy_config = StrategyConfig(
+            name="test",
+            parameters=parameters or {},
+            rebalance_frequency=frequency
+        )
+        return self.service.run_backtest(
+            strategy, strategy_config, self.backtest_config, self.holdings
+        )
+
+    def test_result_series_are_aligned(self):
+        """Test that per-day outputs line up with the simulation dates."""
+        result = self._run(MomentumStrategy(), parameters={"lookback_period": 40, "top_n": 2})
+
+        n = len(result.timestamps)
+        assert n > 200
+        assert len(result.portfolio_values) == n
+        assert len(result.holdings_history) == n
+        assert len(result.daily_returns) == n - 1
+        assert result.timestamps == sorted(result.timestamps)
+        assert pd.Timestamp(result.timestamps[0]) >= pd.Timestamp(self.backtest_config.start_date)
+        assert pd.Timestamp(result.timestamps[-1]) <= pd.Timestamp(self.backtest_config.end_date)
+
+    def test_daily_returns_match_portfolio_values(self):
+        """Test daily returns are simple returns of the value path."""
+        result = self._run(BollingerAttractivenessStrategy(), frequency="weekly")
+
+        values = np.asarray(result.portfolio_values)
+        expected = values[1:] / values[:-1] - 1.0
+        np.testing.assert_allclose(result.daily_returns, expected, rtol=1e-9, atol=1e-12)
+        assert result.total_return == pytest.approx(values[-1] / values[0] - 1.0)
+
+    def test_risk_metrics_match_pandas_definitions(self):
+        """Test ndarray metrics agree with the sample std/mean of the return series."""
+        result = self._run(MomentumStrategy(), parameters={"lookback_period": 40, "top_n": 2})
+
+        returns = pd.Series(result.daily_returns)
+        assert result.volatility == pytest.approx(returns.std() * np.sqrt(252), rel=1e-12)
+        assert result.sharpe_ratio == pytest.approx(returns.mean() * 252 / result.volatility, rel=1e-12)
+
+    def test_fused_value_path_stats_match_vectorized(self):
+        """Test the one-pass return/drawdown kernel agrees with the NumPy reductions."""
+        values = np.array([100.0, 104.0, 98.0, 101.0, 90.0, 95.0, 120.0, 118.0])
+        returns = np.diff(values) / values[:-1]
+
+        mean, std, max_dd = _value_path_stats_nb(values, returns)
+        assert mean == pytest.approx(returns.mean(), rel=1e-12)
+        assert std == pytest.approx(returns.std(ddof=1), rel=1e-12)
+        assert max_dd == pytest.approx(self.service._calculate_max_drawdown(values), rel=1e-12)
+
+    def test_trades_are_executed_and_recorded(self):
+        """Test executed trades carry the documented fields."""
+        result = self._run(MomentumStrategy(), parameters={"lookback_period": 40, "top_n": 2})
+
+        assert result.total_trades == len(result.executed_trades)
+        assert result.total_trades > 0
+        assert result.winning_trades + result.losing_trades <= result.total_trades
+
+        trade = result.executed_trades[0]
+        for key in ("symbol", "action", "quantity_shares", "weight_fraction", "price",
+                    "gross_value", "commission", "slippage", "total_cost",
+                    "net_cash_delta", "timestamp", "reason", "score"):
+            assert key in trade
+        assert trade["action"] in ("buy", "sell")
+
+        # Fills carry the simulation date they executed on, not the strategy's wall clock
+        rebalance_dates = {pd.Timestamp(rb["timestamp"]) for rb in result.rebalance_details}
+        assert {t["timestamp"] for t in result.executed_trades} <= rebalance_dates
+
+    def test_executed_trades_columnar_serialization(self):
+        """Test columnar executed trades hold the same values as the per-trade records."""
+        result = self._run(MomentumStrategy())
+
+        columns = result.to_dict(columnar_trades=True)["executed_trades"]
+        # Serialized from the stored columns; the records are only built on access
+        assert "executed_trades" not in vars(result)
+        assert list(columns) == list(result.executed_trades[0])
+        pd.testing.assert_frame_equal(pd.DataFrame(columns), pd.DataFrame(result.executed_trades))
+        assert result.to_dict()["executed_trades"] is result.executed_trades
+
+    def test_rebalances_on_first_day_of_each_period(self):
+        """Test rebalances land on the first trading day of each calendar period."""
+        result = self._run(BollingerAttractivenessStrategy(), frequency="monthly")
+
+        stamps = pd.DatetimeIndex([pd.Timestamp(rb["timestamp"]) for rb in result.rebalance_details])
+        dates = pd.DatetimeIndex(result.timestamps)
+        month_starts = dates[np.r_[True, dates.month[1:] != dates.month[:-1]]]
+        assert stamps.equals(month_starts[: len(stamps)])
+        assert len(stamps) == len(month_starts)
+
+    def test_rebalance_details_are_opt_in(self):
+        """Test default configs skip rebalance diagnostics without changing the backtest."""
+        detailed = self._run(MomentumStrategy())
+        self.backtest_config = replace(self.backtest_config, capture_diagnostics=False)
+        lean = self._run(MomentumStrategy())
+
+        assert detailed.rebalance_details and lean.rebalance_details == []
+        assert lean.portfolio_values == detailed.portfolio_values
+        assert lean.executed_trades == detailed.executed_trades
+
+    def test_rebalance_mask(self):
+        """Test period-start flags for each rebalance frequency."""
+        dates = pd.bdate_range("2022-12-26", "2023-04-07")
+        weekly = self.service._build_rebalance_mask(dates, "weekly")
+        monthly = self.service._build_rebalance_mask(dates, "monthly")
+        quarterly = self.service._build_rebalance_mask(dates, "Quarterly")
+
+        assert weekly.sum() == 15 and all(d.dayofweek == 0 for d in dates[weekly])
+        assert list(dates[monthly].strftime("%Y-%m-%d")) == [
+            "2022-12-26", "2023-01-02", "2023-02-01", "2023-03-01", "2023-04-03"
+        ]
+        assert list(dates[quarterly].strftime("%Y-%m-%d")) == ["2022-12-26", "2023-01-02", "2023-04-03"]
+        assert self.service._build_rebalance_mask(dates, "daily").all()
+        assert self.service._build_rebalance_mask(dates[:0], "weekly").size == 0
+
+        # Integer period ordinals agree with pandas periods, before the epoch and intraday too
+        for span in (pd.date_range("1969-12-01", periods=120), pd.bdate_range("2023-01-02 15:30", periods=300)):
+            for freq, code in (("daily", "D"), ("weekly", "W"), ("monthly", "M"), ("quarterly", "Q")):
+                periods = span.to_period(code).asi8
+                np.testing.assert_array_equal(
+                    self.service._build_rebalance_mask(span, freq), np.r_[True, periods[1:] != periods[:-1]]
+                )
+
+    def test_rebalance_schedule_is_shared_per_frequency(self):
+        """Test next-due rows point at the following period start and are cached per market."""
+        price_history = self.service._fetch_price_history(self.holdings, self.backtest_config)
+        market = self.service._prepare_market(price_history, self.backtest_config)
+
+        next_due = self.service._rebalance_schedule(market, "monthly")
+        starts = np.flatnonzero(self.service._build_rebalance_mask(market.dates, "monthly"))
+        np.testing.assert_array_equal(next_due[starts[:-1]], starts[1:])
+        assert next_due[-1] == len(market.dates)
+        assert self.service._rebalance_schedule(market, "Monthly") is next_due
+        assert self.service._rebalance_schedule(market, "weekly") is not next_due
+
+    def test_strategy_sees_history_up_to_rebalance_date(self):
+        """Test strategies receive exactly the rows dated on or before each rebalance."""
+        seen = []
+
+        class RecordingStrategy(BollingerAttractivenessStrategy):
+            def execute(self, portfolio_weights, price_data, current_prices, config):
+                seen.append(price_data)
+                return super().execute(portfolio_weights, price_data, current_prices, config)
+
+        result = self._run(RecordingStrategy(), frequency="monthly")
+        history = BacktestingService._normalize_price_history(
+            self.data_service.fetch_price_history(list(seen[0]), None, None)
+        )
+
+        assert len(seen) == len(result.rebalance_details)
+        for price_data, rb in zip(seen, result.rebalance_details):
+            as_of = pd.Timestamp(rb["timestamp"])
+            for symbol, df in price_data.items():
+                expected = history[symbol][history[symbol].index <= as_of]
+                pd.testing.assert_frame_equal(df, expected)
+
+    def test_history_view_slices_on_access(self):
+        """Test the strategy history mapping behaves like the dict of slices it replaces."""
+        price_history = BacktestingService._normalize_price_history(
+            self.data_service.fetch_price_history(["AAPL", "NVDA"], None, None)
+        )
+        dates = price_history["AAPL"].index[[10, 40]]
+        ends = BacktestingService._history_ends(price_history, dates)
+        view = _HistoryView(price_history, ends, 1)
+
+        assert list(view) == ["AAPL", "NVDA"] and len(view) == 2
+        assert "NVDA" in view and "SPY" not in view and view.get("SPY") is None
+        expected = price_history["NVDA"][price_history["NVDA"].index <= dates[1]]
+        pd.testing.assert_frame_equal(view["NVDA"], expected)
+        assert view["NVDA"] is view["NVDA"]
+        assert dict(view).keys() == price_history.keys()
+
+    def test_simulation_dates_union_within_period(self):
+        """Test the date union keeps every symbol's dates in the period, end day inclusive."""
+        frames = {
+            "A": pd.DataFrame({"close": 1.0}, index=pd.date_range("2021-06-01", "2022-06-30 12:00", freq="36h")),
+            "B": pd.DataFrame({"close": 1.0}, index=pd.bdate_range("2022-01-01", "2023-01-31")),
+        }
+        start, end = datetime(2022, 3, 1).date(), datetime(2022, 9, 30).date()
+        union = frames["A"].index.union(frames["B"].index)
+        expected = union[(union >= pd.Timestamp(start)) & (union < pd.Timestamp(end) + pd.Timedelta(days=1))]
+
+        dates = BacktestingService._simulation_dates(frames, start, end)
+        assert dates.equals(expected) and dates.is_unique
+
+    def test_shared_calendar_fast_path_matches_generic_alignment(self):
+        """Test frames on one calendar align the same with and without the fast path."""
+        price_history = BacktestingService._normalize_price_history(
+            self.data_service.fetch_price_history(["AAPL", "MSFT", "GOOGL"], None, None)
+        )
+        shared = BacktestingService._shared_index(price_history)
+        assert shared is not None
+
+        dates = BacktestingService._simulation_dates(
+            price_history, datetime(2022, 3, 1).date(), datetime(2023, 3, 31).date(), shared
+        )
+        assert dates.equals(BacktestingService._simulation_dates(
+            price_history, datetime(2022, 3, 1).date(), datetime(2023, 3, 31).date()
+        ))
+        np.testing.assert_array_equal(
+            BacktestingService._build_close_matrix(price_history, dates, shared),
+            BacktestingService._build_close_matrix(price_history, dates),
+        )
+
+        gappy = BacktestingService._normalize_price_history(
+            self.data_service.fetch_price_history(["AAPL", "NVDA"], None, None)
+        )
+        assert BacktestingService._shared_index(gappy) is None
+
+    def test_normalize_price_history_casts_closes_once(self):
+        """Test ingest makes indexes tz-naive ns and closes float64, once, without touching inputs."""
+        idx = pd.date_range("2022-01-03", periods=4, freq="B", tz="America/New_York", unit="s")
+        raw = pd.DataFrame({"close": [3, 1, 4, 1], "volume": [10, 20, 30, 40]}, index=idx[::-1])
+
+        normalized = BacktestingService._normalize_price_history({"AAPL": raw})["AAPL"]
+
+        assert normalized.index.tz is None and normalized.index.is_monotonic_increasing
+        assert normalized.index.unit == "ns"
+        assert BacktestingService._normalize_price_history({"AAPL": normalized})["AAPL"] is normalized
+        assert normalized["close"].dtype == np.float64
+        assert normalized["volume"].dtype == raw["volume"].dtype
+        assert raw["close"].dtype != np.float64
+
+    def test_prepared_market_arrays_are_contiguous_and_read_only(self):
+        """Test the shared market matrices are C-contiguous float64 and cannot be mutated."""
+        price_history = self.service._fetch_price_history(self.holdings, self.backtest_config)
+        market = self.service._prepare_market(price_history, self.backtest_config)
+
+        assert market.priced_matrix.dtype == np.float64 and market.priced_matrix.flags.c_contiguous
+        assert market.priced_matrix.shape == market.quoted_matrix.shape
+        assert market.priced_matrix.shape == (len(market.dates), len(market.symbols))
+        assert (market.priced_matrix[~market.quoted_matrix] == 0.0).all()
+        assert not market.quoted_matrix.all()  # NVDA has gaps
+        with pytest.raises(ValueError):
+            market.priced_matrix[0, 0] = 0.0
+        with pytest.raises(ValueError):
+            market.history_ends["AAPL"][0] = 0
+
+    def test_run_backtests_batch_matches_individual_runs(self):
+        """Test a batch shares one data fetch and reproduces single backtests."""
+        runs = [
+            (MomentumStrategy(), StrategyConfig(name="mom", parameters={"lookback_period": 40, "top_n": 2})),
+            (MomentumStrategy(), StrategyConfig(name="mom_weekly", rebalance_frequency="weekly")),
+            (BollingerAttractivenessStrategy(), StrategyConfig(name="boll")),
+        ]
+
+        batch = self.service.run_backtests_batch(
+            runs, self.backtest_config, self.holdings, max_workers=3, use_threads=True
+        )
+        assert self.data_service.fetch_price_history_calls == 1
+        assert [r.strategy_name for r in batch] == ["mom", "mom_weekly", "boll"]
+
+        for (strategy, strategy_config), result in zip(runs, batch):
+            single = self.service.run_backtest(strategy, strategy_config, self.backtest_config, self.holdings)
+            assert result.portfolio_values == single.portfolio_values
+            assert result.total_trades == single.total_trades
+
+    def test_run_backtests_batch_on_processes(self):
+        """Test the default process-pool batch reproduces the sequential results in order."""
+        runs = [
+            (MomentumStrategy(), StrategyConfig(name="mom", parameters={"lookback_period": 40, "top_n": 2})),
+            (BollingerAttractivenessStrategy(), StrategyConfig(name="boll", rebalance_frequency="weekly")),
+        ]
+
+        sequential = self.service.run_backtests_batch(runs, self.backtest_config, self.holdings, max_workers=1)
+        processed = self.service.run_backtests_batch(runs, self.backtest_config, self.holdings)
+
+        assert [r.strategy_name for r in processed] == ["mom", "boll"]
+        for a, b in zip(sequential, processed):
+            assert a.portfolio_values == b.portfolio_values
+            assert a.executed_trades == b.executed_trades
+
+    def test_repeated_backtests_reuse_fetched_market(self):
+        """Test price history is fetched once per holdings and period until cleared."""
+        first = self._run(MomentumStrategy())
+        second = self._run(BollingerAttractivenessStrategy(), frequency="weekly")
+        assert self.data_service.fetch_price_history_calls == 1
+        assert self._run(MomentumStrategy()).portfolio_values == first.portfolio_values
+        assert second.portfolio_values
+        # Results built from one cached market get their own timestamp lists
+        assert second.timestamps == first.timestamps and second.timestamps is not first.timestamps
+        assert len(second.holdings_history) == len(second.timestamps)
+
+        self.service.clear_cache()
+        self._run(MomentumStrategy())
+        assert self.data_service.fetch_price_history_calls == 2
+
+        uncached = BacktestingService(self.data_service, market_cache_size=0)
+        for _ in range(2):
+            uncached.run_backtest(
+                MomentumStrategy(), StrategyConfig(name="t"), self.backtest_config, self.holdings
+            )
+        assert self.data_service.fetch_price_history_calls == 4
+
+    def test_partial_fetch_is_not_cached(self):
+        """Test a fetch that dropped a symbol is retried by the next backtest."""
+        fetch = self.data_service.fetch_price_history
+
+        def drop_msft_once(symbols, start_date, end_date):
+            history = fetch(symbols, start_date, end_date)
+            if self.data_service.fetch_price_history_calls == 1:
+                history.pop("MSFT")
+            return history
+
+        self.data_service.fetch_price_history = drop_msft_once
+        self._run(MomentumStrategy())
+        self._run(MomentumStrategy())
+        self._run(MomentumStrategy())
+        assert self.data_service.fetch_price_history_calls == 2
+
+    def test_market_reaching_today_expires(self, monkeypatch):
+        """Test a cached market whose period reaches today is refetched after the TTL."""
+        monkeypatch.setattr(backtester, "_MARKET_CACHE_TTL_SECONDS", 0.0)
+        self._run(MomentumStrategy())
+        self._run(MomentumStrategy())
+        assert self.data_service.fetch_price_history_calls == 1
+
+        open_config = replace(self.backtest_config, end_date=datetime.now())
+        for _ in range(2):
+            self.service.run_backtest(
+                MomentumStrategy(), StrategyConfig(name="t"), open_config, self.holdings
+            )
+        assert self.data_service.fetch_price_history_calls == 3
+
+    def test_initial_value_does_not_exceed_capital(self):
+        """Test initial holdings plus cash are valued at initial capital when affordable."""
+        result = self._run(BollingerAttractivenessStrategy())
+
+        assert result.portfolio_values[0] >= self.backtest_config.initial_capital - 1e-6
+        assert result.holdings_history[0] == self.holdings
+
+    def test_holdings_matrix_expands_to_independent_days(self):
+        """Test holdings are stored as a day-by-symbol matrix and expand to one dict per day."""
+        result = self._run(MomentumStrategy(), frequency="quarterly")
+
+        matrix = result.holdings_matrix
+        assert matrix.shape == (len(result.timestamps), len(result.holdings_symbols))
+        assert len(np.unique(np.nan_to_num(matrix, nan=-1.0), axis=0)) <= len(result.rebalance_details) + 1
+        frame = result.holdings_frame()
+        assert list(frame.columns) == result.holdings_symbols and len(frame) == len(matrix)
+
+        history = result.holdings_history
+        assert len(history) == len(result.timestamps)
+        assert history[0] == self.holdings and history[0] is not self.holdings
+        # Editing one day leaves the others in the same holding stretch untouched
+        day = len(history) - 2
+        assert history[day] == history[day + 1]
+        history[day]["AAPL"] = -1.0
+        assert history[day + 1]["AAPL"] != -1.0
+
+    def test_max_drawdown_bounds(self):
+        """Test max drawdown is a fraction in [0, 1]."""
+        result = self._run(MomentumStrategy(), frequency="quarterly")
+
+        assert 0.0 <= result.max_drawdown <= 1.0
+        assert self.service._calculate_max_drawdown([100.0, 120.0, 90.0, 130.0]) == pytest.approx(0.25)
+
+    def test_benchmark_return_over_inclusive_period(self):
+        """Test the benchmark return spans the first to last close within the period."""
+        price_history = BacktestingService._normalize_price_history(
+            self.data_service.fetch_price_history(["SPY"], None, None)
+        )
+        closes = price_history["SPY"]["close"]
+        start, end = datetime(2022, 2, 1), datetime(2022, 8, 31)
+        period = closes[(closes.index >= start) & (closes.index <= end)]
+
+        metrics = self.service._calculate_benchmark_metrics("SPY", price_history, start, end)
+
+        assert metrics["benchmark_return"] == pytest.approx(period.iloc[-1] / period.iloc[0] - 1)
+        assert self.service._calculate_benchmark_metrics(
+            "SPY", price_history, end, start
+        )["benchmark_return"] == 0.0
+
+    def test_execute_trades_applies_in_order(self):
+        """Test buys are gated by remaining cash and sells capped by shares held."""
+        trades = [
+            Trade(symbol="AAPL", action=TradeAction.SELL, quantity=0.5),  # capped at 10 shares held
+            Trade(symbol="MSFT", action=TradeAction.BUY, quantity=0.3),   # funded by the sale
+            Trade(symbol="NVDA", action=TradeAction.BUY, quantity=0.3),   # not enough cash left
+            Trade(symbol="SPY", action=TradeAction.BUY, quantity=0.3),    # no price: skipped
+        ]
+        stats = self.service._execute_trades(
+            trades,
+            {"AAPL": 10.0},
+            0.0,
+            {"AAPL": 100.0, "MSFT": 50.0, "NVDA": 25.0},
+            self.backtest_config,
+            2000.0,
+            pd.Timestamp("2022-03-01"),
+        )
+
+        commission = self.backtest_config.commission + self.backtest_config.slippage
+        assert stats["num_trades"] == 2
+        assert stats["new_holdings"]["AAPL"] == 0.0
+        assert stats["new_holdings"]["MSFT"] == pytest.approx(600.0 / 50.0)
+        assert "NVDA" not in stats["new_holdings"]
+        assert stats["filled_holdings"] == {"AAPL": 0.0, "MSFT": pytest.approx(12.0)}
+        assert stats["new_cash"] == pytest.approx(1000.0 * (1 - commission) - 600.0 * (1 + commission))
+        assert [t["action"] for t in stats["executed"]] == ["sell", "buy"]
+        assert stats["executed"][0]["quantity_shares"] == 10.0
+        assert stats["winning_trades"] + stats["losing_trades"] == 1
+
+        # Coded by market column, the same fills come back as an updated holdings vector
+        column_index = {"NVDA": 0, "AAPL": 1, "MSFT": 2}
+        holdings_vec = np.array([0.0, 10.0, 0.0])
+        by_column = self.service._execute_trades(
+            trades,
+            {"AAPL": 10.0},
+            0.0,
+            {"AAPL": 100.0, "MSFT": 50.0, "NVDA": 25.0},
+            self.backtest_config,
+            2000.0,
+            pd.Timestamp("2022-03-01"),
+            column_index=column_index,
+            holdings_vec=holdings_vec,
+        )
+        assert by_column["executed"] == stats["executed"]
+        assert by_column["new_holdings"] == stats["new_holdings"]
+        np.testing.assert_array_equal(by_column["holdings_vec"], [0.0, 0.0, stats["new_holdings"]["MSFT"]])
+        assert holdings_vec[1] == 10.0  # caller's vector is left untouched
+
+    def test_sells_lose_when_costs_exceed_breakeven(self):
+        """Test the win/loss heuristic follows the configured cost rate."""
+        trades = [Trade(symbol="AAPL", action=TradeAction.SELL, quantity=1.0)]
+        costly = BacktestConfig(
+            start_date=datetime(2022, 1, 1),
+            end_date=datetime(2022, 12, 31),
+            commission=0.04,
+            slippage=0.02,
+        )
+        for config, expected in ((self.backtest_config, (1, 0)), (costly, (0, 1))):
+            stats = self.service._execute_trades(
+                trades, {"AAPL": 10.0}, 0.0, {"AAPL": 100.0}, config, 1000.0, pd.Timestamp("2022-03-01")
+            )
+            assert (stats["winning_trades"], stats["losing_trades"]) == expected
+
+    def test_to_float_conversions(self):
+        """Test best-effort float conversion of the scalar types strategies return."""
+        to_float = BacktestingService._to_float
+        assert to_float(1.5) == 1.5 and to_float(2) == 2.0
+        assert to_float(np.float32(0.25)) == 0.25 and to_float(np.int64(3)) == 3.0
+        assert to_float(np.array(4.0)) == 4.0 and to_float("0.5") == 0.5
+        for bad in (None, "abc", pd.Timestamp("2022-01-03"), np.array([1.0, 2.0])):
+            assert np.isnan(to_float(bad))
+
+    def test_warm_up_kernels_is_side_effect_free(self):
+        """Test kernel warm-up runs standalone and does not change backtest results."""
+        before = self._run(MomentumStrategy()).portfolio_values
+        warm_up_kernels()
+        assert self._run(MomentumStrategy()).portfolio_values == before
+
+    def test_trade_buffer_grows_and_round_trips(self):
+        """Test the columnar trade buffer survives reallocation and keeps record shape."""
+        buffer = _TradeBuffer(capacity=2)
+        for k in range(5):
+            buffer.extend(
+                ["AAPL" if k % 2 else "MSFT"],
+                np.array([0 if k % 2 else 1], dtype=np.uint8),
+                datetime(2022, 1, 3 + k),
+                [None],
+                None if k == 0 else np.array([float(k)]),
+                quantity_shares=np.array([float(k)]), weight_fraction=np.array([0.1]),
+                price=np.array([100.0 + k]), gross_value=np.array([10.0]),
+                commission=np.array([0.01]), slippage=np.array([0.005]),
+                total_cost=np.array([0.015]), net_cash_delta=np.array([-10.015]),
+            )
+
+        records = buffer.to_records()
+        assert len(buffer) == 5 and buffer.capacity >= 5
+        assert [r["symbol"] for r in records] == ["MSFT", "AAPL", "MSFT", "AAPL", "MSFT"]
+        assert records[1]["action"] == "buy" and records[2]["action"] == "sell"
+        assert records[0]["score"] is None and records[4]["score"] == 4.0
+        assert records[3]["price"] == 103.0
+        assert records[3]["timestamp"] == datetime(2022, 1, 6)
+
+    def test_executed_trades_frame_matches_records(self):
+        """Test the columnar trade log builds the same frame as the trade records."""
+        result = self._run(BollingerAttractivenessStrategy())
+        assert result.executed_trades
+
+        frame = result.executed_trades_frame()
+        pd.testing.assert_frame_equal(frame, pd.DataFrame(result.executed_trades))
+        result.executed_trades_columns = None  # records-only producers
+        pd.testing.assert_frame_equal(result.executed_trades_frame(), frame)
+
+    def test_trade_buffer_extend_records_batches(self):
+        """Test batch extends grow the buffer and record one trade per row."""
+        stamp = np.datetime64("2022-01-03", "ns")
+        numeric = {name: np.arange(3, dtype=np.float64) + j for j, name in enumerate(
+            ("quantity_shares", "weight_fraction", "price", "gross_value",
+             "commission", "slippage", "total_cost", "net_cash_delta")
+        )}
+        scores = np.array([0.5, np.nan, 1.5])
+        buffer = _TradeBuffer(capacity=1)
+        buffer.extend(list("ABC"), np.array([0, 1, 0], dtype=np.int8), stamp, ["r"] * 3, scores, **numeric)
+        buffer.extend([], np.array([], dtype=np.int8), stamp, [], None)
+
+        assert len(buffer) == 3 and buffer.capacity >= 3
+        records = buffer.to_records()
+        assert [r["symbol"] for r in records] == ["A", "B", "C"]
+        assert [r["action"] for r in records] == ["buy", "sell", "buy"]
+        assert records[2]["score"] == 1.5 and np.isnan(records[1]["score"])
+        assert [r["price"] for r in records] == numeric["price"].tolist()
+        assert all(r["timestamp"] == pd.Timestamp(stamp) and r["reason"] == "r" for r in records)
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -4,6 +4,8 @@ Tests for data provider services.
 
 import pytest
 import os
+import subprocess
+import sys
 from datetime import datetime
 import pandas as pd
 
@@ -110,6 +112,145 @@ class TestDataProviders:
             assert self.alphavantage_service.get_data_source_name() == "alphavantage"
 
 
+def test_providers_load_on_first_access():
+    """Test importing the package defers provider modules until a provider is used."""
+    code = (
+        "import sys, portfolio_lib\n"
+        "assert 'portfolio_lib.services.data.yfinance' not in sys.modules\n"
+        "from portfolio_lib import YFinanceDataService\n"
+        "from portfolio_lib.services.data import YFinanceDataService as Provider\n"
+        "assert Provider is YFinanceDataService\n"
+        "assert 'portfolio_lib.services.data.yfinance' in sys.modules\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_star_import_exports_only_available_classes():
+    """Test ``import *`` lists the lazy classes and never an unavailable provider."""
+    namespace = {}
+    exec("from portfolio_lib.services.data import *", namespace)
+    exported = {name: value for name, value in namespace.items() if not name.startswith("__")}
+    assert {"DataService", "YFinanceDataService", "CachedDataService", "ParquetCache"} <= set(exported)
+    assert all(value is not None for value in exported.values())
+
+
+CACHE_DATES = pd.bdate_range("2023-12-01", "2024-03-29", tz="America/New_York")
+CACHE_HISTORY = pd.DataFrame({"close": range(len(CACHE_DATES))}, index=CACHE_DATES, dtype=float)
+
+
+def _cache_window(start_date, end_date):
+    """The test history from start_date through end_date."""
+    window = (CACHE_HISTORY.index >= pd.Timestamp(start_date, tz=CACHE_DATES.tz)) & (
+        CACHE_HISTORY.index <= pd.Timestamp(end_date, tz=CACHE_DATES.tz)
+    )
+    return CACHE_HISTORY[window]
+
+
+@pytest.fixture
+def cached_service(tmp_path, monkeypatch):
+    """CachedDataService over a recording provider, storing frames with pickle."""
+    from portfolio_lib.services.data import CachedDataService, ParquetCache
+
+    # The cache logic does not depend on the parquet engine, which is optional
+    monkeypatch.setattr(ParquetCache, "_read_frame", staticmethod(pd.read_pickle))
+    monkeypatch.setattr(
+        ParquetCache, "_write_frame", staticmethod(lambda df, path: df.to_pickle(path))
+    )
+    calls = []
+
+    class RecordingDataService:
+        def fetch_price_history(self, symbols, start_date, end_date):
+            calls.append((list(symbols), start_date, end_date))
+            return {symbol: _cache_window(start_date, end_date) for symbol in symbols}
+
+        def get_data_source_name(self):
+            return "recording"
+
+    return CachedDataService(RecordingDataService(), ParquetCache(tmp_path)), calls
+
+
+def test_price_history_cache_fetches_only_missing(cached_service):
+    """Test cached history is reused and only new symbols and trailing days are fetched."""
+    service, calls = cached_service
+    service.fetch_price_history(["AAPL"], "2024-01-01", "2024-02-29")
+    cached = service.fetch_price_history(["AAPL"], "2024-01-15", "2024-02-29")
+    earlier = service.fetch_price_history(["AAPL"], "2024-01-01", "2024-01-31")
+    assert len(calls) == 1
+    pd.testing.assert_frame_equal(cached["AAPL"], _cache_window("2024-01-15", "2024-02-29"))
+    pd.testing.assert_frame_equal(earlier["AAPL"], _cache_window("2024-01-01", "2024-01-31"))
+
+    extended = service.fetch_price_history(["AAPL", "MSFT"], "2024-01-01", "2024-03-29")
+    assert calls[1:] == [
+        (["MSFT"], "2024-01-01", "2024-03-29"),
+        (["AAPL"], "2024-02-29", "2024-03-29"),
+    ]
+    pd.testing.assert_frame_equal(extended["AAPL"], _cache_window("2024-01-01", "2024-03-29"))
+    assert list(extended) == ["AAPL", "MSFT"]
+
+    # A narrower request later on is still served from the widened entry
+    service.fetch_price_history(["AAPL"], "2024-02-01", "2024-02-15")
+    assert len(calls) == 3
+
+
+def test_price_history_cache_refreshes_stale_tail_and_never_shrinks(cached_service):
+    """Test stale entries refetch their last day and writes never narrow an entry."""
+    from portfolio_lib.services.data.cache import store_price_history
+
+    service, calls = cached_service
+    service.fetch_price_history(["AAPL"], "2024-01-01", "2024-02-29")
+
+    service.cache.ttl_seconds = 0
+    closed = service.fetch_price_history(["AAPL"], "2024-01-10", "2024-02-01")
+    assert len(calls) == 1  # days before the entry's last row are closed
+    pd.testing.assert_frame_equal(closed["AAPL"], _cache_window("2024-01-10", "2024-02-01"))
+    service.fetch_price_history(["AAPL"], "2024-01-10", "2024-02-29")
+    assert calls[-1] == (["AAPL"], "2024-02-29", "2024-02-29")
+
+    # Starting earlier refetches the union of both ranges
+    service.cache.ttl_seconds = None
+    service.fetch_price_history(["AAPL"], "2023-12-15", "2024-01-05")
+    assert calls[-1] == (["AAPL"], "2023-12-15", "2024-02-29")
+
+    # Narrower overlapping and shorter disjoint writes leave the entry's range intact
+    store_price_history(
+        service.cache, "recording", {"AAPL": _cache_window("2024-02-01", "2024-02-15")},
+        "2024-02-01", "2024-02-15",
+    )
+    store_price_history(
+        service.cache, "recording", {"AAPL": _cache_window("2023-12-01", "2023-12-05")},
+        "2023-12-01", "2023-12-05",
+    )
+    full = service.fetch_price_history(["AAPL"], "2023-12-15", "2024-02-29")
+    assert len(calls) == 3
+    pd.testing.assert_frame_equal(full["AAPL"], _cache_window("2023-12-15", "2024-02-29"))
+
+
+def test_alphavantage_batch_quote_errors_disable_batch_endpoint(monkeypatch):
+    """Test an error payload from the batch endpoint stops later batch requests."""
+    pytest.importorskip("alpha_vantage")
+    import requests
+
+    calls = []
+
+    class ErrorResponse:
+        def raise_for_status(self):
+            pass
+
+        def json(self):
+            return {"Information": "This is a premium endpoint."}
+
+    def fake_get(*args, **kwargs):
+        calls.append(kwargs["params"]["symbols"])
+        return ErrorResponse()
+
+    monkeypatch.setattr(requests, "get", fake_get)
+    service = AlphaVantageDataService(api_key="demo", requests_per_minute=6000)
+    symbols = [f"SYM{i}" for i in range(150)]
+    assert service._fetch_batch_quotes(symbols) == {}
+    assert service._fetch_batch_quotes(symbols) == {}
+    assert len(calls) == 1
+
+
 if __name__ == "__main__":
     # To run these tests:
     # 1. Ensure you have pytest installed: pip install pytest
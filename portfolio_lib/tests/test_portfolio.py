@@ -173,6 +173,26 @@ class TestPortfolio:
         portfolio.add_holding("AAPL", 150.0)
         assert portfolio.holdings["AAPL"] == 150.0
     
+    def test_set_holdings(self):
+        """Test batch updating holdings."""
+        portfolio = Portfolio(
+            name="Test Portfolio",
+            holdings=self.sample_holdings.copy(),
+            data_service=self.mock_data_service
+        )
+        
+        portfolio.set_holdings({"TSLA": 25.0, "AAPL": 150.0})
+        
+        assert portfolio.holdings["TSLA"] == 25.0
+        assert portfolio.holdings["AAPL"] == 150.0
+        assert portfolio.symbols == ["AAPL", "GOOGL", "MSFT", "TSLA"]
+        assert abs(sum(portfolio.get_position_values().values()) - portfolio.total_value) < 0.01
+        
+        # Invalid entries reject the whole batch
+        with pytest.raises(ValueError, match="Invalid shares"):
+            portfolio.set_holdings({"NVDA": 10.0, "AMD": -1.0})
+        assert "NVDA" not in portfolio.holdings
+    
     def test_remove_holding(self):
         """Test removing holdings from portfolio."""
         portfolio = Portfolio(
@@ -270,6 +290,61 @@ class TestPortfolio:
         assert isinstance(portfolio_dict['current_weights'], dict)
         assert isinstance(portfolio_dict['data_source'], str)
     
+    def test_valuation_cache_invalidated_on_holdings_change(self):
+        """Test memoized total value and weights follow holdings changes."""
+        portfolio = Portfolio(
+            name="Test Portfolio",
+            holdings=self.sample_holdings.copy(),
+            data_service=self.mock_data_service
+        )
+        
+        initial_value = portfolio.total_value
+        assert portfolio.total_value == initial_value
+        
+        portfolio.add_holding("AAPL", 200.0)
+        assert portfolio.total_value > initial_value
+        
+        portfolio.holdings = {"MSFT": 10.0}
+        assert set(portfolio.current_weights) == {"MSFT"}
+        assert abs(portfolio.current_weights["MSFT"] - 1.0) < 1e-9
+    
+    def test_holdings_read_only(self):
+        """Test holdings can only change through methods that keep valuations in sync."""
+        portfolio = Portfolio(
+            name="Test Portfolio",
+            holdings=self.sample_holdings.copy(),
+            data_service=self.mock_data_service
+        )
+        
+        with pytest.raises(TypeError):
+            portfolio.holdings["AAPL"] = 5.0
+        
+        new_holdings = {"MSFT": 10.0}
+        portfolio.holdings = new_holdings
+        new_holdings["AAPL"] = 5.0
+        assert portfolio.holdings == {"MSFT": 10.0}
+        
+        with pytest.raises(ValueError):
+            portfolio.holdings = {"MSFT": -1.0}
+        assert portfolio.holdings == {"MSFT": 10.0}
+    
+    def test_run_backtest_skips_current_prices(self):
+        """Test backtests value holdings from history without a current-price fetch."""
+        from portfolio_lib.models.strategy import BacktestConfig
+        
+        portfolio = Portfolio(
+            name="Test Portfolio",
+            holdings=self.sample_holdings,
+            data_service=self.mock_data_service
+        )
+        
+        config = BacktestConfig(start_date=datetime(2023, 1, 1), end_date=datetime(2023, 6, 30))
+        result = portfolio.run_backtest("momentum", config)
+        
+        assert self.mock_data_service.fetch_price_history_called
+        assert not self.mock_data_service.fetch_current_prices_called
+        assert len(result.portfolio_values) > 0
+    
     def test_position_values(self):
         """Test position values calculation."""
         portfolio = Portfolio(
@@ -291,6 +366,22 @@ class TestPortfolio:
         total_from_positions = sum(position_values.values())
         assert abs(total_from_positions - portfolio.total_value) < 0.01
 
+    
+    def test_max_drawdown_from_returns(self):
+        """Test max drawdown compounds returns and measures the worst fall from peak."""
+        portfolio = Portfolio(
+            name="Test Portfolio",
+            holdings=self.sample_holdings,
+            data_service=self.mock_data_service
+        )
+        
+        returns = np.array([0.10, -0.20, 0.05, -0.10, 0.30])
+        growth = np.cumprod(1.0 + returns)
+        expected = np.max(1.0 - growth / np.maximum.accumulate(growth))
+        
+        assert portfolio._calculate_max_drawdown(returns) == pytest.approx(expected)
+        assert portfolio._calculate_max_drawdown(pd.Series(returns)) == pytest.approx(expected)
+        assert portfolio._calculate_max_drawdown(np.array([])) == 0.0
 
 if __name__ == "__main__":
     pytest.main([__file__])